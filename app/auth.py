@@ -1,25 +1,136 @@
-import os, hmac, hashlib, base64
-from fastapi import Request, HTTPException
+# app/auth.py
+"""
+Dashboard sessions.
+
+A session cookie is `<expires>.<nonce>|<hmac>`: it stops working at
+`expires` (SESSION_TTL after login), on /logout, or when SESSION_SECRET
+changes. Digests of verified tokens are remembered in a small LRU until
+they expire, so the HMAC is computed once per session rather than once per
+request, and the store never holds a live cookie.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from fastapi import HTTPException, Request
+from fastapi.responses import RedirectResponse
+from starlette.requests import cookie_parser
 
 SECRET = os.environ.get("SESSION_SECRET", "dev-secret").encode()
 PASSWORD = os.environ.get("APP_PASSWORD", "sportscar")
+SESSION_TTL = int(os.environ.get("SESSION_TTL", str(12 * 3600)))
+SESSION_CACHE_SIZE = int(os.environ.get("SESSION_CACHE_SIZE", "1024"))
+COOKIE_NAME = "session"
+
+
+def _sig(value: str) -> bytes:
+    digest = hmac.new(SECRET, value.encode(), hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).rstrip(b"=")
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode("utf-8", "surrogatepass")).digest()
+
+
+class SessionStore:
+    """Token issue/verify plus a bounded LRU of verified token digests -> expiry."""
+
+    def __init__(self, max_items: int = SESSION_CACHE_SIZE):
+        self.max_items = max_items
+        self._verified: "OrderedDict[bytes, int]" = OrderedDict()
+        self._revoked: Dict[str, int] = {}  # nonce -> expiry, dropped once expired
+        self._lock = threading.Lock()
+
+    def issue(self, ttl: int = SESSION_TTL) -> str:
+        value = f"{int(time.time()) + ttl}.{secrets.token_urlsafe(12)}"
+        return f"{value}|{_sig(value).decode()}"
 
-def _sign(value: str) -> str:
-    sig = hmac.new(SECRET, value.encode(), hashlib.sha256).digest()
-    return f"{value}|{base64.urlsafe_b64encode(sig).decode()}"
+    def verify(self, token: Optional[str]) -> bool:
+        if not token:
+            return False
+        now = time.time()
+        key = _token_key(token)
+        with self._lock:
+            expires = self._verified.get(key)
+            if expires is not None:
+                if expires > now:
+                    self._verified.move_to_end(key)
+                    return True
+                del self._verified[key]
+                return False
+        try:
+            value, sig = token.split("|", 1)
+            expires_s, nonce = value.split(".", 1)
+            expires = int(expires_s)
+            # bytes on both sides: compare_digest rejects non-ASCII str
+            if expires <= now or not hmac.compare_digest(sig.encode(), _sig(value)):
+                return False
+        except (TypeError, ValueError):  # UnicodeError is a ValueError
+            return False
+        with self._lock:
+            if nonce in self._revoked:
+                return False
+            self._verified[key] = expires
+            if len(self._verified) > self.max_items:
+                self._verified.popitem(last=False)
+        return True
+
+    def revoke(self, token: Optional[str]) -> None:
+        if not token:
+            return
+        try:
+            expires_s, nonce = token.split("|", 1)[0].split(".", 1)
+            expires = int(expires_s)
+        except ValueError:
+            return
+        now = time.time()
+        with self._lock:
+            self._verified.pop(_token_key(token), None)
+            self._revoked = {n: e for n, e in self._revoked.items() if e > now}
+            self._revoked[nonce] = expires
+
+
+sessions = SessionStore()
 
-def _verify(signed: str) -> bool:
-    try:
-        value, sig_b64 = signed.split("|", 1)
-        expect = hmac.new(SECRET, value.encode(), hashlib.sha256).digest()
-        return hmac.compare_digest(base64.urlsafe_b64decode(sig_b64), expect)
-    except Exception:
-        return False
 
 def new_session_cookie_value() -> str:
-    return _sign("ok")
+    return sessions.issue()
+
 
 def require_login(request: Request):
-    token = request.cookies.get("session")
-    if not token or not _verify(token):
+    if not sessions.verify(request.cookies.get(COOKIE_NAME)):
         raise HTTPException(status_code=401, detail="Unauthorized")
+
+
+def _session_cookie(scope) -> Optional[str]:
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            return cookie_parser(value.decode("latin-1")).get(COOKIE_NAME)
+    return None
+
+
+class LoginRequired:
+    """
+    Pure ASGI middleware: redirects unauthenticated HTTP requests to /login.
+    Unlike @app.middleware("http") it doesn't wrap every request/response in
+    BaseHTTPMiddleware's extra task and streams.
+    """
+
+    def __init__(self, app, public_paths: Iterable[str] = (), public_prefixes: Iterable[str] = ()):
+        self.app = app
+        self.public_paths = frozenset(public_paths)
+        self.public_prefixes = tuple(public_prefixes)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        path = scope["path"]
+        if path in self.public_paths or path.startswith(self.public_prefixes) or sessions.verify(_session_cookie(scope)):
+            return await self.app(scope, receive, send)
+        await RedirectResponse("/login")(scope, receive, send)
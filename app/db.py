@@ -1,6 +1,9 @@
 from sqlmodel import SQLModel, Field, Session, create_engine, select
+from sqlalchemy import event
 from datetime import datetime
 from typing import Optional, Callable
+from app import search
+import os
 
 class Car(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
@@ -23,23 +26,73 @@ class Car(SQLModel, table=True):
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
-_engine = create_engine("sqlite:///cars.db")
+DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///cars.db")
+
+# SQLite profile: WAL so grid reads don't wait on crawl writes, one writer
+# connection that locks up front (BEGIN IMMEDIATE), and query_only readers.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": -1024 * int(os.environ.get("SQLITE_CACHE_MB", "32")),
+    "mmap_size": 1024 * 1024 * int(os.environ.get("SQLITE_MMAP_MB", "128")),
+    "temp_store": "MEMORY",
+    "journal_size_limit": 64 * 1024 * 1024,
+}
+
+def _sqlite_engine(writer: bool):
+    eng = create_engine(
+        DATABASE_URL,
+        connect_args={"check_same_thread": False},
+        pool_size=1 if writer else int(os.environ.get("SQLITE_READ_POOL", "8")),
+        max_overflow=0,
+        pool_timeout=60,
+    )
+
+    @event.listens_for(eng, "connect")
+    def _on_connect(dbapi_conn, _record):
+        dbapi_conn.isolation_level = None  # transactions are started by _on_begin
+        cur = dbapi_conn.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cur.execute(f"PRAGMA {name}={value}")
+        if not writer:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+
+    @event.listens_for(eng, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if writer else "BEGIN")
+
+    return eng
+
+if DATABASE_URL.startswith("sqlite:///"):
+    _engine = _sqlite_engine(writer=True)
+    _read_engine = _sqlite_engine(writer=False)
+else:
+    _engine = _read_engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 SQLModel.metadata.create_all(_engine)
+search.install(_engine)
 
 def get_db():
     with Session(_engine) as s:
         yield Database(s)
 
+def get_read_db():
+    with Session(_read_engine) as s:
+        yield Database(s)
+
 class Database:
     def __init__(self, s: Session):
         self.s = s
     def list_cars(self):
         return self.s.exec(select(Car).order_by(Car.created_at.desc())).all()
     def search(self, q: str):
-        stmt = select(Car).where(
-            (Car.make.ilike(f"%{q}%")) | (Car.model.ilike(f"%{q}%")) | (Car.vin.ilike(f"%{q}%")) | (Car.stock.ilike(f"%{q}%"))
-        ).order_by(Car.created_at.desc())
-        return self.s.exec(stmt).all()
+        # full-text index (app/search.py), most relevant first
+        ids = search.search_ids(self.s.connection(), q)
+        if not ids:
+            return []
+        by_id = {c.id: c for c in self.s.exec(select(Car).where(Car.id.in_(ids))).all()}
+        return [by_id[i] for i in ids if i in by_id]
     def get(self, id: int) -> Car:
         return self.s.get(Car, id)
     def upsert_from_dict(self, d: dict) -> Car:
@@ -1,11 +1,12 @@
 from fastapi import FastAPI, Request, Form, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from jinja2 import Environment, FileSystemLoader, select_autoescape
-from app.auth import require_login, new_session_cookie_value, PASSWORD
-from app.db import get_db, Car
+from app.auth import COOKIE_NAME, PASSWORD, SESSION_TTL, LoginRequired, new_session_cookie_value, sessions
+from app.db import get_db, get_read_db, Car
 from app.scraper import parse_listing
 from app.sticker import render_sticker
+from app.thumbs import get_thumb, thumb_src, thumb_version
 from typing import Optional
 
 app = FastAPI()
@@ -14,18 +15,9 @@ env = Environment(
     loader=FileSystemLoader("templates"),
     autoescape=select_autoescape(["html", "xml"])
 )
+env.globals["thumb_src"] = thumb_src
 
-@app.middleware("http")
-async def auth_redirect(request: Request, call_next):
-    if request.url.path.startswith("/static"):
-        return await call_next(request)
-    if request.url.path in ("/login", "/do-login"):
-        return await call_next(request)
-    try:
-        require_login(request)
-    except Exception:
-        return RedirectResponse("/login")
-    return await call_next(request)
+app.add_middleware(LoginRequired, public_paths=("/login", "/do-login"), public_prefixes=("/static",))
 
 @app.get("/login", response_class=HTMLResponse)
 def login_page(request: Request):  # <-- accept request
@@ -38,11 +30,18 @@ def do_login(password: str = Form(...)):
     if password != PASSWORD:
         return RedirectResponse("/login?error=1", status_code=303)
     resp = RedirectResponse("/", status_code=303)
-    resp.set_cookie("session", new_session_cookie_value(), httponly=True, samesite="Lax")
+    resp.set_cookie(COOKIE_NAME, new_session_cookie_value(), max_age=SESSION_TTL, httponly=True, samesite="Lax")
+    return resp
+
+@app.get("/logout")
+def logout(request: Request):
+    sessions.revoke(request.cookies.get(COOKIE_NAME))
+    resp = RedirectResponse("/login", status_code=303)
+    resp.delete_cookie(COOKIE_NAME)
     return resp
 
 @app.get("/", response_class=HTMLResponse)
-def grid(request: Request, db=Depends(get_db), q: Optional[str] = None):
+def grid(request: Request, db=Depends(get_read_db), q: Optional[str] = None):
     cars = db.search(q) if q else db.list_cars()
     return env.get_template("grid.html").render(
         cars=cars,
@@ -50,7 +49,7 @@ def grid(request: Request, db=Depends(get_db), q: Optional[str] = None):
     )
 
 @app.get("/cars/{car_id}", response_class=HTMLResponse)
-def detail(car_id: int, request: Request, db=Depends(get_db)):
+def detail(car_id: int, request: Request, db=Depends(get_read_db)):
     car = db.get(car_id)
     if not car:
         return RedirectResponse("/", status_code=303)
@@ -66,7 +65,7 @@ def add_car(url: str = Form(...), db=Depends(get_db)):
     return RedirectResponse(f"/cars/{car.id}", status_code=303)
 
 @app.get("/cars/{car_id}/sticker.png")
-def sticker(car_id: int, db=Depends(get_db)):
+def sticker(car_id: int, db=Depends(get_read_db)):
     car = db.get(car_id)
     if not car:
         return RedirectResponse("/", status_code=303)
@@ -76,3 +75,20 @@ def sticker(car_id: int, db=Depends(get_db)):
         media_type="image/png",
         headers={"Content-Disposition": f'attachment; filename=sticker-{car.stock or car.id}.png'}
     )
+
+@app.get("/thumbs/{car_id}")
+def thumb(car_id: int, v: Optional[str] = None, db=Depends(get_read_db)):
+    car = db.get(car_id)
+    if not car or not car.thumb_url:
+        return RedirectResponse("/static/placeholder.png", status_code=303)
+    try:
+        data = get_thumb(car.thumb_url)
+    except Exception:
+        # dealer image unreachable/undecodable: let the browser try the original
+        return RedirectResponse(car.thumb_url, status_code=302)
+    current = v == thumb_version(car.thumb_url)
+    return Response(
+        data,
+        media_type="image/webp",
+        headers={"Cache-Control": "public, max-age=31536000, immutable" if current else "public, max-age=300"},
+    )
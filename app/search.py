@@ -0,0 +1,197 @@
+# app/search.py
+"""
+Inventory search index.
+
+SQLite: a contentless FTS5 table `car_fts` (rowid = car.id) kept in sync by
+triggers on `car`, where every search token is a prefix match, plus a
+trigram FTS5 table `car_tri` over vin/stock so a token can also hit the
+middle of a VIN or stock number ("XYZ" in "WP0ABXYZ123"), as ILIKE did.
+A car matches when every token hits either index. Results are ordered by
+bm25 relevance (make/model weigh more than vin/stock), newest first on
+ties; substring-only matches come after the ranked ones.
+
+Postgres: an expression GIN index over to_tsvector('simple', ...) for the
+words plus pg_trgm GIN indexes on vin/stock for partial matches. Expression
+indexes are maintained by Postgres itself, so no triggers are needed there.
+"""
+import logging
+import re
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+log = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"[0-9A-Za-z]+")
+SEARCH_LIMIT = 500
+
+# bm25 weights per FTS column: make, model, vin, stock
+_WEIGHTS = "10.0, 8.0, 4.0, 4.0"
+
+_SQLITE_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS car_fts USING fts5(
+        make, model, vin, stock,
+        content='', tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS car_fts_ai AFTER INSERT ON car BEGIN
+        INSERT INTO car_fts(rowid, make, model, vin, stock)
+        VALUES (new.id, new.make, new.model, new.vin, new.stock);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS car_fts_ad AFTER DELETE ON car BEGIN
+        INSERT INTO car_fts(car_fts, rowid, make, model, vin, stock)
+        VALUES ('delete', old.id, old.make, old.model, old.vin, old.stock);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS car_fts_au AFTER UPDATE OF make, model, vin, stock ON car BEGIN
+        INSERT INTO car_fts(car_fts, rowid, make, model, vin, stock)
+        VALUES ('delete', old.id, old.make, old.model, old.vin, old.stock);
+        INSERT INTO car_fts(rowid, make, model, vin, stock)
+        VALUES (new.id, new.make, new.model, new.vin, new.stock);
+    END""",
+]
+
+# trigram tokenizer needs SQLite >= 3.34; without it substrings fall back to LIKE
+_SQLITE_TRIGRAM_DDL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS car_tri USING fts5(
+        vin, stock, content='', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS car_tri_ai AFTER INSERT ON car BEGIN
+        INSERT INTO car_tri(rowid, vin, stock) VALUES (new.id, new.vin, new.stock);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS car_tri_ad AFTER DELETE ON car BEGIN
+        INSERT INTO car_tri(car_tri, rowid, vin, stock) VALUES ('delete', old.id, old.vin, old.stock);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS car_tri_au AFTER UPDATE OF vin, stock ON car BEGIN
+        INSERT INTO car_tri(car_tri, rowid, vin, stock) VALUES ('delete', old.id, old.vin, old.stock);
+        INSERT INTO car_tri(rowid, vin, stock) VALUES (new.id, new.vin, new.stock);
+    END""",
+]
+_trigram = True
+_TRIGRAM_MIN = 3  # shorter tokens have no trigram to look up
+
+_PG_DOC = "to_tsvector('simple', coalesce(make, '') || ' ' || coalesce(model, ''))"
+_PG_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_car_search_doc ON car USING gin ({_PG_DOC})",
+    "CREATE INDEX IF NOT EXISTS ix_car_vin_trgm ON car USING gin (vin gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_car_stock_trgm ON car USING gin (stock gin_trgm_ops)",
+]
+
+
+def tokens(q: str) -> List[str]:
+    return _TOKEN.findall(q or "")
+
+
+def fts_query(q: str) -> str:
+    """User text -> FTS5 MATCH expression: every token must prefix-match some column."""
+    return " ".join(f'"{t}"*' for t in tokens(q))
+
+
+def install(engine: Engine) -> None:
+    """Create the index (idempotent) and backfill it if it's empty but cars exist."""
+    with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            for ddl in _SQLITE_DDL:
+                conn.exec_driver_sql(ddl)
+            _install_trigram(conn)
+            has_cars = conn.exec_driver_sql("SELECT 1 FROM car LIMIT 1").first()
+            if has_cars and not conn.exec_driver_sql("SELECT count(*) FROM car_fts_docsize").scalar():
+                rebuild(conn)
+            elif has_cars and _trigram and not conn.exec_driver_sql("SELECT count(*) FROM car_tri_docsize").scalar():
+                _rebuild_trigram(conn)
+        elif conn.dialect.name == "postgresql":
+            for ddl in _PG_DDL:
+                conn.exec_driver_sql(ddl)
+
+
+def _install_trigram(conn: Connection) -> None:
+    global _trigram
+    try:
+        with conn.begin_nested():
+            for ddl in _SQLITE_TRIGRAM_DDL:
+                conn.exec_driver_sql(ddl)
+    except OperationalError as e:
+        _trigram = False
+        log.warning("FTS5 trigram tokenizer unavailable (%s); partial VIN/stock search uses LIKE", e)
+
+
+def rebuild(conn: Connection) -> None:
+    conn.exec_driver_sql("INSERT INTO car_fts(car_fts) VALUES ('delete-all')")
+    conn.exec_driver_sql(
+        "INSERT INTO car_fts(rowid, make, model, vin, stock) "
+        "SELECT id, make, model, vin, stock FROM car"
+    )
+    if _trigram:
+        _rebuild_trigram(conn)
+
+
+def _rebuild_trigram(conn: Connection) -> None:
+    conn.exec_driver_sql("INSERT INTO car_tri(car_tri) VALUES ('delete-all')")
+    conn.exec_driver_sql("INSERT INTO car_tri(rowid, vin, stock) SELECT id, vin, stock FROM car")
+
+
+def search_ids(conn: Connection, q: str, limit: int = SEARCH_LIMIT) -> List[int]:
+    """Matching car ids, most relevant first."""
+    if not tokens(q):
+        return []
+    if conn.dialect.name == "postgresql":
+        return _pg_search_ids(conn, q, limit)
+
+    ranked = [
+        r[0]
+        for r in conn.execute(
+            text(
+                f"SELECT car_fts.rowid FROM car_fts JOIN car c ON c.id = car_fts.rowid "
+                f"WHERE car_fts MATCH :q ORDER BY bm25(car_fts, {_WEIGHTS}), c.created_at DESC LIMIT :n"
+            ),
+            {"q": fts_query(q), "n": limit},
+        )
+    ]
+    if len(ranked) >= limit:
+        return ranked  # substring-only matches would rank after these anyway
+    seen = set(ranked)
+    extra = [i for i in _substring_ids(conn, q, limit + len(ranked)) if i not in seen]
+    return ranked + extra[: limit - len(ranked)]
+
+
+def _substring_ids(conn: Connection, q: str, limit: int) -> List[int]:
+    """Cars where every token prefix-matches a word or is a substring of vin/stock, newest first."""
+    sets, params = [], {"n": limit}
+    for i, t in enumerate(tokens(q)):
+        params[f"w{i}"] = f'"{t}"*'
+        if _trigram and len(t) >= _TRIGRAM_MIN:
+            params[f"s{i}"] = f'"{t}"'
+            sub = f"SELECT rowid FROM car_tri WHERE car_tri MATCH :s{i}"
+        else:
+            params[f"s{i}"] = f"%{t}%"
+            sub = f"SELECT id FROM car WHERE vin LIKE :s{i} OR stock LIKE :s{i}"
+        sets.append(f"SELECT rowid AS id FROM car_fts WHERE car_fts MATCH :w{i} UNION {sub}")
+    hits = " INTERSECT ".join(f"SELECT id FROM ({s_})" for s_ in sets)
+    rows = conn.execute(
+        text(f"SELECT c.id FROM car c WHERE c.id IN ({hits}) ORDER BY c.created_at DESC LIMIT :n"),
+        params,
+    )
+    return [r[0] for r in rows]
+
+
+def _pg_search_ids(conn: Connection, q: str, limit: int) -> List[int]:
+    toks = tokens(q)
+    tsq = " & ".join(f"{t}:*" for t in toks)
+    # each token must hit the words or be a substring of vin/stock (trigram-indexed)
+    conds = " AND ".join(
+        f"({_PG_DOC} @@ to_tsquery('simple', :t{i} || ':*') OR vin ILIKE :l{i} OR stock ILIKE :l{i})"
+        for i in range(len(toks))
+    )
+    params = {"tsq": tsq, "n": limit}
+    for i, t in enumerate(toks):
+        params[f"t{i}"] = t
+        params[f"l{i}"] = f"%{t}%"
+    rows = conn.execute(
+        text(
+            f"SELECT id FROM car WHERE {conds} "
+            f"ORDER BY ts_rank({_PG_DOC}, to_tsquery('simple', :tsq)) DESC, created_at DESC LIMIT :n"
+        ),
+        params,
+    )
+    return [r[0] for r in rows]
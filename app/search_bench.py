@@ -0,0 +1,102 @@
+# app/search_bench.py
+"""
+Grid search at scale: the old four-column ILIKE scan vs the FTS5 index.
+
+    python -m app.search_bench [--cars 100000]
+
+Builds a throwaway SQLite DB (not cars.db) with synthetic inventory.
+"""
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+
+from app import search
+
+MAKES = {
+    "Porsche": ["911", "Boxster", "Cayman", "928", "944"],
+    "Ferrari": ["F430", "California", "308", "Testarossa"],
+    "Mercedes-Benz": ["SL-Class", "E-Class", "G-Class"],
+    "BMW": ["M3", "M5", "Z8", "Z4"],
+    "Chevrolet": ["Corvette", "Camaro"],
+    "Lamborghini": ["Gallardo", "Huracan"],
+}
+
+DDL = """CREATE TABLE car (
+    id INTEGER PRIMARY KEY, stock VARCHAR, year INTEGER, make VARCHAR, model VARCHAR, vin VARCHAR,
+    url VARCHAR NOT NULL, status VARCHAR, created_at DATETIME, updated_at DATETIME
+)"""
+
+ILIKE = text(
+    "SELECT id FROM car WHERE lower(make) LIKE lower(:p) OR lower(model) LIKE lower(:p) "
+    "OR lower(vin) LIKE lower(:p) OR lower(stock) LIKE lower(:p) ORDER BY created_at DESC"
+)
+
+
+def _rows(n: int):
+    rnd = random.Random(42)
+    t0 = datetime(2020, 1, 1)
+    alnum = string.ascii_uppercase + string.digits
+    for i in range(n):
+        make = rnd.choice(list(MAKES))
+        yield {
+            "id": i + 1,
+            "stock": f"{rnd.choice('ABCP')}{rnd.randint(1000, 99999)}",
+            "year": rnd.randint(1965, 2024),
+            "make": make,
+            "model": rnd.choice(MAKES[make]),
+            "vin": "".join(rnd.choice(alnum) for _ in range(17)),
+            "url": f"https://example.test/c-{i}.htm",
+            "status": "OnLot",
+            "created_at": t0 + timedelta(minutes=i),
+        }
+
+
+def _time(fn, rounds: int):
+    fn()  # warm-up
+    t = time.perf_counter()
+    for _ in range(rounds):
+        out = fn()
+    return (time.perf_counter() - t) / rounds * 1000, out
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(prog="python -m app.search_bench", description=__doc__.strip().splitlines()[0])
+    p.add_argument("--cars", type=int, default=100_000)
+    p.add_argument("--rounds", type=int, default=5)
+    args = p.parse_args(argv)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="scla-search-"), "bench.db")
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(DDL)
+    search.install(engine)
+
+    rows = list(_rows(args.cars))
+    t = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO car (id, stock, year, make, model, vin, url, status, created_at) "
+            "VALUES (:id, :stock, :year, :make, :model, :vin, :url, :status, :created_at)"
+        ), rows)
+    print(f"inserted {args.cars:,} cars (index kept in sync by triggers) in {time.perf_counter() - t:.1f}s")
+
+    sample = rows[len(rows) // 2]
+    queries = ["porsche", "911", "porsche 911", "cay", sample["vin"][:8], sample["vin"][6:11], sample["stock"][:4], "zzzz"]
+    print(f"{'query':<14} {'ILIKE ms':>9} {'hits':>7} {'FTS ms':>9} {'hits':>7}")
+    with engine.connect() as conn:
+        for q in queries:
+            like_ms, like_ids = _time(lambda: conn.execute(ILIKE, {"p": f"%{q}%"}).all(), args.rounds)
+            fts_ms, fts_ids = _time(lambda: search.search_ids(conn, q), args.rounds)
+            print(f"{q:<14} {like_ms:>9.2f} {len(like_ids):>7} {fts_ms:>9.2f} {len(fts_ids):>7}")
+    print(f"(FTS results capped at {search.SEARCH_LIMIT}; ILIKE returns every match)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,9 @@
 # app/sticker.py
+from functools import lru_cache
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
-import qrcode, os
+import numpy as np
+import qrcode, os, threading
 
 TEMPLATE_PATH = os.environ.get("STICKER_TEMPLATE", "templates/sticker_template.png")
 
@@ -15,15 +17,49 @@ CANDIDATE_FONTS = [
     "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
 ]
 
+def _stamp(path: str):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+@lru_cache(maxsize=256)
+def _truetype(path: str, size: int, stamp):
+    # `stamp` (mtime, size) is part of the key so an edited font file is reloaded
+    return ImageFont.truetype(path, size=size)
+
 def load_font(size: int):
     for p in CANDIDATE_FONTS:
-        if p and os.path.exists(p):
-            try:
-                return ImageFont.truetype(p, size=size)
-            except OSError:
-                pass
+        if not p:
+            continue
+        stamp = _stamp(p)
+        if stamp is None:
+            continue
+        try:
+            return _truetype(p, size, stamp)
+        except OSError:
+            pass
     return ImageFont.load_default()
 
+_template_lock = threading.Lock()
+_template = {"stamp": None, "image": None}
+
+def load_template() -> Image.Image:
+    """Decoded RGB template, cached per process; returns a copy to draw on."""
+    stamp = _stamp(TEMPLATE_PATH)
+    with _template_lock:
+        if _template["image"] is None or _template["stamp"] != stamp:
+            with Image.open(TEMPLATE_PATH) as im:
+                _template["image"] = im.convert("RGB")
+            _template["stamp"] = stamp
+        return _template["image"].copy()
+
+@lru_cache(maxsize=8192)
+def _text_length(font, text: str) -> float:
+    # fonts are cached per (path, size) above, so this is memoized per (font, size, text)
+    return font.getlength(text)
+
 def wrap_lines(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFont, max_width: int):
     """Word-wrap text to fit a max pixel width."""
     if not text:
@@ -32,7 +68,7 @@ def wrap_lines(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFon
     lines, line = [], ""
     for w in words:
         test = w if not line else f"{line} {w}"
-        if draw.textlength(test, font=font) <= max_width:
+        if _text_length(font, test) <= max_width:
             line = test
         else:
             if line:
@@ -54,6 +90,16 @@ def draw_text(draw, pos, text, max_width, font, fill="black", line_spacing_ratio
         draw.text((x, y), ln, font=font, fill=fill)
         y += line_h + spacing
 
+@lru_cache(maxsize=1024)
+def qr_image(data: str, size: int = 100) -> Image.Image:
+    """QR bitmap scaled straight from the module matrix (nearest, no PIL resample); cached per URL."""
+    qr = qrcode.QRCode(border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    m = np.asarray(qr.get_matrix(), dtype=bool)
+    idx = ((2 * np.arange(size) + 1) * m.shape[0]) // (2 * size)
+    return Image.fromarray(np.where(m[np.ix_(idx, idx)], 0, 255).astype(np.uint8))
+
 def render_sticker(car) -> BytesIO:
     # Map car fields -> your coordinate layout
     data = {
@@ -72,7 +118,7 @@ def render_sticker(car) -> BytesIO:
     }
 
     # Load template & drawing context
-    img = Image.open(TEMPLATE_PATH).convert("RGB")
+    img = load_template()
     draw = ImageDraw.Draw(img)
 
     # Fonts
@@ -123,12 +169,7 @@ def render_sticker(car) -> BytesIO:
 
     # QR Code (bottom-left per your example)
     qr_url = data["url"] or "https://example.com"
-    qr = qrcode.QRCode(box_size=3, border=2)
-    qr.add_data(qr_url)
-    qr.make(fit=True)
-    qr_img = qr.make_image(fill_color="black", back_color="white").convert("RGB")
-    qr_img = qr_img.resize((100, 100))
-    img.paste(qr_img, (40, 650))
+    img.paste(qr_image(qr_url), (40, 650))
 
     # Return as bytes
     out = BytesIO()
@@ -0,0 +1,125 @@
+# app/thumbs.py
+"""
+Local copies of listing photos for the grid.
+
+`thumb_url` points at the dealer's full-size og:image. The first request for
+a car fetches it once and writes a 480px WebP next to the other cache files;
+every later request (and every other browser) gets that file. Paths carry a
+version of the source URL, so the browser may cache them forever.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from typing import Optional
+
+import requests
+from PIL import Image, ImageOps
+
+THUMB_DIR = os.environ.get("THUMB_CACHE_DIR", os.path.join(tempfile.gettempdir(), "sticker-dashboard-thumbs"))
+THUMB_WIDTH = int(os.environ.get("THUMB_WIDTH", "480"))
+THUMB_CACHE_MB = int(os.environ.get("THUMB_CACHE_MB", "200"))
+MAX_SOURCE_BYTES = 15 * 1024 * 1024
+
+_locks = [threading.Lock() for _ in range(32)]
+
+# LRU index of the cached files (name -> size), so hits and evictions never
+# walk the directory; seeded from disk on first use, oldest mtime first.
+_index: "Optional[OrderedDict[str, int]]" = None
+_total = 0
+_index_lock = threading.Lock()
+
+
+def thumb_version(src_url: str) -> str:
+    return hashlib.sha256(src_url.encode("utf-8")).hexdigest()[:12]
+
+
+def thumb_src(car) -> Optional[str]:
+    """Grid <img> src for a car: the cached proxy when it has a photo."""
+    if not car.thumb_url:
+        return None
+    return f"/thumbs/{car.id}?v={thumb_version(car.thumb_url)}"
+
+
+def _path(src_url: str) -> str:
+    key = hashlib.sha256(src_url.encode("utf-8")).hexdigest()[:40]
+    return os.path.join(THUMB_DIR, f"{key}-{THUMB_WIDTH}.webp")
+
+
+def _resize(data: bytes) -> bytes:
+    img = ImageOps.exif_transpose(Image.open(BytesIO(data)))
+    if img.mode not in ("RGB", "L"):
+        img = img.convert("RGB")
+    if img.width > THUMB_WIDTH:
+        img = img.resize((THUMB_WIDTH, max(1, round(img.height * THUMB_WIDTH / img.width))), Image.Resampling.LANCZOS)
+    out = BytesIO()
+    img.save(out, format="WEBP", quality=80, method=4)
+    return out.getvalue()
+
+
+def _load_index() -> "OrderedDict[str, int]":
+    global _index, _total
+    if _index is None:
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        entries = []
+        for entry in os.scandir(THUMB_DIR):
+            if entry.name.endswith(".webp"):  # skips in-flight .tmp files
+                st = entry.stat()
+                entries.append((st.st_mtime, entry.name, st.st_size))
+        _index = OrderedDict((name, size) for _, name, size in sorted(entries))
+        _total = sum(_index.values())
+    return _index
+
+
+def _touch(name: str) -> bool:
+    with _index_lock:
+        index = _load_index()
+        if name not in index:
+            return False
+        index.move_to_end(name)
+        return True
+
+
+def _add(name: str, size: int) -> None:
+    global _total
+    victims = []
+    with _index_lock:
+        index = _load_index()
+        _total += size - index.pop(name, 0)
+        index[name] = size
+        while _total > THUMB_CACHE_MB * 1024 * 1024 and len(index) > 1:
+            victim, victim_size = index.popitem(last=False)
+            _total -= victim_size
+            victims.append(victim)
+    for victim in victims:
+        try:
+            os.remove(os.path.join(THUMB_DIR, victim))
+        except OSError:
+            pass
+
+
+def get_thumb(src_url: str) -> bytes:
+    """Resized WebP for `src_url`; fetched and encoded only on the first request."""
+    path = _path(src_url)
+    name = os.path.basename(path)
+    with _locks[hash(path) % len(_locks)]:
+        if _touch(name):
+            try:
+                with open(path, "rb") as fh:
+                    return fh.read()
+            except OSError:
+                pass  # evicted or removed underneath us; make it again
+        r = requests.get(src_url, timeout=20, headers={"User-Agent": "StickerDashboard/1.0 (+github)"}, stream=True)
+        r.raise_for_status()
+        data = r.raw.read(MAX_SOURCE_BYTES + 1, decode_content=True)
+        if len(data) > MAX_SOURCE_BYTES:
+            raise ValueError("source image too large")
+        out = _resize(data)
+        fd, tmp = tempfile.mkstemp(dir=THUMB_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(out)
+        os.replace(tmp, path)
+        _add(name, len(out))
+    return out
@@ -1,17 +1,93 @@
 # backend/app/db.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 import os
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./scla.db")
 
-connect_args = {}
-if DATABASE_URL.startswith("sqlite"):
-    # Needed for SQLite when used within FastAPI / threads
+# SQLite storage profile (ignored on other backends). WAL lets readers run
+# alongside the crawl's writes; NORMAL sync is durable across app crashes
+# under WAL, only an OS crash can lose the last commits.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": -1024 * int(os.getenv("SQLITE_CACHE_MB", "32")),  # negative = KiB
+    "mmap_size": 1024 * 1024 * int(os.getenv("SQLITE_MMAP_MB", "128")),
+    "temp_store": "MEMORY",
+    "journal_size_limit": 64 * 1024 * 1024,  # keep the -wal file from eating the small disk
+}
+SQLITE_READ_POOL = int(os.getenv("SQLITE_READ_POOL", "8"))
+
+def _is_file_sqlite(url: str) -> bool:
+    u = make_url(url)
+    return u.get_backend_name() == "sqlite" and u.database not in (None, "", ":memory:")
+
+def _apply_pragmas(engine, *, writer: bool) -> None:
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_conn, _record):
+        # let SQLAlchemy's "begin" event below decide how transactions start
+        dbapi_conn.isolation_level = None
+        cur = dbapi_conn.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cur.execute(f"PRAGMA {name}={value}")
+        if not writer:
+            cur.execute("PRAGMA query_only=ON")
+        cur.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        # the writer takes the write lock up front instead of upgrading mid-transaction,
+        # which is what produces "database is locked" despite busy_timeout
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if writer else "BEGIN")
+
+if _is_file_sqlite(DATABASE_URL):
+    # One writer connection (threads queue for it in the pool, not on SQLite's
+    # lock) plus a pool of query_only readers.
     connect_args = {"check_same_thread": False}
+    engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_size=1, max_overflow=0, pool_timeout=60)
+    read_engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_size=SQLITE_READ_POOL, max_overflow=0)
+    _apply_pragmas(engine, writer=True)
+    _apply_pragmas(read_engine, writer=False)
+else:
+    connect_args = {}
+    if DATABASE_URL.startswith("sqlite"):
+        # Needed for SQLite when used within FastAPI / threads
+        connect_args = {"check_same_thread": False}
+    engine = create_engine(DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
+    read_engine = engine
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, connect_args=connect_args)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+# read-only work (listings, lookups, sticker payloads); same DB as SessionLocal
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
 
 class Base(DeclarativeBase):
     pass
+
+def add_missing_columns(bind=engine) -> None:
+    """
+    create_all() never alters existing tables, so columns added to a model
+    later are ALTER TABLE ... ADD COLUMN'd here (nullable, no backfill).
+    """
+    from sqlalchemy import inspect, text
+
+    with bind.begin() as conn:
+        insp = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            have = {c["name"] for c in insp.get_columns(table.name)}
+            for col in table.columns:
+                if col.name not in have:
+                    ddl = col.type.compile(dialect=bind.dialect)
+                    conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{col.name}" {ddl}'))
+
+def add_missing_indexes(bind=engine) -> None:
+    """Create indexes declared on models after their table already existed."""
+    from sqlalchemy.schema import CreateIndex
+
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
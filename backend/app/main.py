@@ -1,15 +1,35 @@
-from fastapi import FastAPI, Response
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from .db import Base, engine
-from app.db import engine, Base
+from app.db import engine, Base, SessionLocal, ReadSessionLocal, add_missing_columns, add_missing_indexes
 from app.models.car import Car
-from .routers import cars, services, documents, pricing, scan
-from .routers.stickers import generate_sticker
+from app.models.fetch_state import FetchState
+from .routers import cars, services, documents, pricing, scan, stickers, thumbs
+from .routers.stickers import sticker_response
+from .utils.identity import backfill_vin_norm
+from .utils.render_pool import render_pool
+from .utils.sticker_prerender import prerenderer
+from .utils.sticker_render import payload_from_car
 from . import models
 
 Base.metadata.create_all(bind=engine)
+add_missing_columns(engine)
+add_missing_indexes(engine)
+with SessionLocal() as _db:
+    backfill_vin_norm(_db)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    prerenderer.start()
+    yield
+    # the pre-render thread feeds the pool, so it has to stop first
+    prerenderer.stop()
+    render_pool.shutdown()
 
-app = FastAPI(title="SportsCarLA Hub API")
+app = FastAPI(title="SportsCarLA Hub API", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -24,13 +44,21 @@ app.include_router(services.router)
 app.include_router(documents.router)
 app.include_router(pricing.router)
 app.include_router(scan.router)
+app.include_router(stickers.router)
+app.include_router(thumbs.router)
 
 @app.get("/healthz")
 def health():
     return {"ok": True}
 
 @app.get("/sticker/{car_id}")
-def sticker(car_id: int):
-    # TODO: load real car by ID to render exact sticker
-    png = generate_sticker({"price": 32999, "year": 1995, "make": "Porsche", "model": "911", "miles": 65432})
-    return Response(content=png, media_type="image/png")
+def sticker(car_id: int, if_none_match: Optional[str] = Header(None)):
+    db = ReadSessionLocal()
+    try:
+        car = db.get(Car, car_id)
+        if not car:
+            raise HTTPException(404, "Car not found")
+        payload = payload_from_car(car)
+    finally:
+        db.close()
+    return sticker_response(payload, "png", if_none_match)
@@ -0,0 +1,7 @@
+# backend/app/models/__init__.py
+from app.models.car import Car
+from app.models.document import DocumentTemplate
+from app.models.fetch_state import FetchState
+from app.models.service import ServiceItem
+
+__all__ = ["Car", "DocumentTemplate", "FetchState", "ServiceItem"]
@@ -1,13 +1,16 @@
 # backend/app/models/car.py
 from __future__ import annotations
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import String, Integer, DateTime, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String, Integer, DateTime, Index, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
 
 from app.db import Base
 
+if TYPE_CHECKING:
+    from app.models.service import ServiceItem
+
 class Car(Base):
     __tablename__ = "cars"
 
@@ -17,11 +20,14 @@ class Car(Base):
     url: Mapped[str] = mapped_column(String(500), unique=True, index=True)
     stock: Mapped[Optional[str]] = mapped_column(String(64), index=True, nullable=True)
     vin: Mapped[Optional[str]] = mapped_column(String(64), index=True, nullable=True)
+    # uppercase/stripped VIN used for identity matching (see utils/identity.py)
+    vin_norm: Mapped[Optional[str]] = mapped_column(String(64), index=True, nullable=True)
 
     # Display
     year: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     make: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     model: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    trim: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
     body_style: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
 
     exterior_color: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
@@ -42,7 +48,23 @@ class Car(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    services: Mapped[List["ServiceItem"]] = relationship(
+        back_populates="car", cascade="all, delete-orphan", order_by="ServiceItem.id"
+    )
+
+    @validates("vin")
+    def _sync_vin_norm(self, key, value):
+        from app.utils.identity import normalize_vin
+        self.vin_norm = normalize_vin(value)
+        return value
+
     __table_args__ = (
         # stock/vin are NOT guaranteed unique on this site; we keep soft uniqueness via indexes above
         UniqueConstraint("url", name="uq_car_url"),
+        # listing: keyset order + the filters exposed by /cars/ (see utils/car_query.py)
+        Index("ix_cars_created_at_id", "created_at", "id"),
+        Index("ix_cars_status_lower_created_at_id", func.lower(status), "created_at", "id"),
+        Index("ix_cars_make_lower", func.lower(make)),
+        Index("ix_cars_year", "year"),
+        Index("ix_cars_price", "price"),
     )
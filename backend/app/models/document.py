@@ -0,0 +1,17 @@
+# backend/app/models/document.py
+from __future__ import annotations
+from typing import Optional
+
+from sqlalchemy import String, Boolean, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+class DocumentTemplate(Base):
+    __tablename__ = "document_templates"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[Optional[str]] = mapped_column(String(128), unique=True, nullable=True)
+    version: Mapped[str] = mapped_column(String(32), default="v1")
+    url: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # link to latest PDF/doc stored in S3/Drive/etc
+    active: Mapped[bool] = mapped_column(Boolean, default=True)
@@ -0,0 +1,23 @@
+# backend/app/models/fetch_state.py
+from __future__ import annotations
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import String, Integer, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db import Base
+
+class FetchState(Base):
+    """Per-URL HTTP validators + parsed-record hash, used to skip unchanged detail pages."""
+    __tablename__ = "fetch_state"
+
+    url: Mapped[str] = mapped_column(String(500), primary_key=True)
+
+    etag: Mapped[Optional[str]] = mapped_column(String(256), nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)  # sha256 of parsed record
+
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    changed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
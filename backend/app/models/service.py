@@ -0,0 +1,27 @@
+# backend/app/models/service.py
+from __future__ import annotations
+from datetime import datetime
+from typing import TYPE_CHECKING, Optional
+
+from sqlalchemy import String, Float, DateTime, ForeignKey, Text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db import Base
+
+if TYPE_CHECKING:
+    from app.models.car import Car
+
+class ServiceItem(Base):
+    __tablename__ = "service_items"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    car_id: Mapped[int] = mapped_column(ForeignKey("cars.id", ondelete="CASCADE"), index=True)
+
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    parts_cost: Mapped[float] = mapped_column(Float, default=0)
+    labor_hours: Mapped[float] = mapped_column(Float, default=0)
+    labor_rate: Mapped[float] = mapped_column(Float, default=125)
+    vendor: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    car: Mapped["Car"] = relationship(back_populates="services")
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from ..db import SessionLocal
+from typing import Literal, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, raiseload, selectinload
+from ..db import ReadSessionLocal, SessionLocal
 from .. import models, schemas
 from ..security import require_token
+from ..utils.car_ingest import BULK_CHUNK_SIZE, RESULT_STATUSES, ingest_chunk
+from ..utils.car_query import BadCursor, CarFilters, fetch_page
+from ..utils.serialize import ORJSONResponse
+from ..utils.sticker_prerender import prerenderer
 
 router = APIRouter(prefix="/cars", tags=["cars"])
 
@@ -13,20 +21,136 @@ def get_db():
     finally:
         db.close()
 
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 @router.post("/", response_model=schemas.CarOut, dependencies=[Depends(require_token)])
 def create_car(payload: schemas.CarIn, db: Session = Depends(get_db)):
-    car = models.Car(**payload.model_dump())
-    db.add(car)
+    """Create a car, or update the one with this URL (only the fields sent) so re-posts are safe."""
+    car = db.query(models.Car).filter_by(url=payload.url).one_or_none()
+    if car is None:
+        car = models.Car(**payload.model_dump())
+        db.add(car)
+    else:
+        for key, value in payload.model_dump(exclude_unset=True).items():
+            setattr(car, key, value)
     db.commit()
     db.refresh(car)
+    prerenderer.enqueue_cars([car])
     return car
 
-@router.get("/", response_model=list[schemas.CarOut])
-def list_cars(db: Session = Depends(get_db)):
-    return db.query(models.Car).order_by(models.Car.created_at.desc()).all()
+async def _ndjson_items(request: Request):
+    """(index, item) per non-blank line of a streamed NDJSON body; bad lines yield the decode error."""
+    buf, index = b"", 0
+    async for chunk in request.stream():
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield index, _loads(line)
+                index += 1
+    if buf.strip():
+        yield index, _loads(buf)
+
+def _loads(line: bytes):
+    try:
+        return orjson.loads(line)
+    except orjson.JSONDecodeError as e:
+        return ValueError(f"invalid JSON: {e}")
+
+@router.post("/bulk", dependencies=[Depends(require_token)])
+async def bulk_upsert_cars(request: Request):
+    """
+    Upsert many cars by url. Body is a JSON array of CarIn objects, or NDJSON
+    (Content-Type: application/x-ndjson), read as it streams in. Items are
+    written in chunks of CARS_BULK_CHUNK, one transaction per chunk; only the
+    fields an item sends are updated. Returns counts plus one result per item
+    (in request order): created / updated / unchanged / error.
+    """
+    results = []
+
+    def run_chunk(items):
+        db = SessionLocal()
+        try:
+            return ingest_chunk(db, items)
+        finally:
+            db.close()
+
+    if "ndjson" in request.headers.get("content-type", ""):
+        chunk = []
+        async for item in _ndjson_items(request):
+            chunk.append(item)
+            if len(chunk) >= BULK_CHUNK_SIZE:
+                results += await run_in_threadpool(run_chunk, chunk)
+                chunk = []
+        if chunk:
+            results += await run_in_threadpool(run_chunk, chunk)
+    else:
+        try:
+            body = orjson.loads(await request.body())
+        except orjson.JSONDecodeError as e:
+            raise HTTPException(400, f"Invalid JSON: {e}")
+        if not isinstance(body, list):
+            raise HTTPException(400, "Expected a JSON array of cars (or NDJSON)")
+        items = list(enumerate(body))
+        for i in range(0, len(items), BULK_CHUNK_SIZE):
+            results += await run_in_threadpool(run_chunk, items[i:i + BULK_CHUNK_SIZE])
+
+    counts = {s: 0 for s in RESULT_STATUSES}
+    for r in results:
+        counts[r["status"]] += 1
+    return ORJSONResponse({**counts, "results": results})
+
+EXPANSIONS = {"services"}
+
+def car_filters(
+    status: Optional[str] = None,
+    make: Optional[str] = None,
+    year_min: Optional[int] = None,
+    year_max: Optional[int] = None,
+    price_min: Optional[int] = Query(None, ge=0),
+    price_max: Optional[int] = Query(None, ge=0),
+) -> CarFilters:
+    return CarFilters(status, make, year_min, year_max, price_min, price_max)
+
+@router.get("/", response_model=schemas.CarPageOut)
+def list_cars(
+    filters: CarFilters = Depends(car_filters),
+    sort: Literal["created", "id"] = "created",
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    total: bool = Query(False, description="Also return a (possibly estimated) match count"),
+    include: Optional[str] = Query(None, description="Comma-separated expansions: services"),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Newest-first page of cars; follow `next_cursor` for the next one.
+
+    Items are lean by default. `include=services` batch-loads every car's
+    services in one extra SELECT ... IN query; otherwise touching the
+    relationship raises instead of silently issuing a query per car.
+    """
+    expand = {part.strip() for part in (include or "").split(",") if part.strip()}
+    if expand - EXPANSIONS:
+        raise HTTPException(400, f"Unknown include: {', '.join(sorted(expand - EXPANSIONS))}")
+    with_services = "services" in expand
+
+    try:
+        page = fetch_page(
+            db, filters, sort=sort, cursor=cursor, limit=limit, with_total=total,
+            options=[selectinload(models.Car.services) if with_services else raiseload(models.Car.services)],
+        )
+    except BadCursor as e:
+        raise HTTPException(400, str(e))
+    item = schemas.CarOut if with_services else schemas.CarSummaryOut
+    return {**vars(page), "items": [item.model_validate(c) for c in page.items]}
 
 @router.get("/{car_id}", response_model=schemas.CarOut)
-def get_car(car_id: int, db: Session = Depends(get_db)):
+def get_car(car_id: int, db: Session = Depends(get_read_db)):
     car = db.get(models.Car, car_id)
     if not car:
         raise HTTPException(404, "Car not found")
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from ..db import SessionLocal
+from ..db import ReadSessionLocal
 from .. import models
 
 router = APIRouter(prefix="/documents", tags=["documents"])
 
 def get_db():
-    db = SessionLocal()
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
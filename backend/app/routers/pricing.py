@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from ..db import SessionLocal
+from ..db import ReadSessionLocal
 from .. import models, schemas
 from ..utils.pricing_engine import estimate
 
 router = APIRouter(prefix="/pricing", tags=["pricing"])
 
 def get_db():
-    db = SessionLocal()
+    db = ReadSessionLocal()
     try:
         yield db
     finally:
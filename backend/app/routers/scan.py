@@ -1,38 +1,25 @@
-from fastapi import APIRouter, Query
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from app.db import SessionLocal
+from app.db import ReadSessionLocal
 from app.models.car import Car
-from app.utils.scraper import get_all_active_urls, scrape_urls_and_persist
+from app.utils.car_query import BadCursor, CarFilters, fetch_page
+from app.utils.jobs import jobs
+from app.utils.serialize import ORJSONResponse, car_to_dict, cars_to_dicts
+from app.utils.scraper import PROGRESS_KEYS, get_all_active_urls, scrape_urls_and_persist
 
-router = APIRouter(prefix="/scan", tags=["scan"])
+router = APIRouter(prefix="/scan", tags=["scan"], default_response_class=ORJSONResponse)
 
 @router.get("/car")
 def get_car_by_url(url: str):
-    db: Session = SessionLocal()
+    db: Session = ReadSessionLocal()
     try:
         car = db.query(Car).filter_by(url=url).one_or_none()
         if not car:
             return {"error": "not found"}
-        return {
-            "id": car.id,
-            "url": car.url,
-            "stock": car.stock,
-            "vin": car.vin,
-            "year": car.year,
-            "make": car.make,
-            "model": car.model,
-            "body_style": car.body_style,
-            "exterior_color": car.exterior_color,
-            "interior_color": car.interior_color,
-            "miles": car.miles,
-            "transmission": car.transmission,
-            "engine": car.engine,
-            "price": car.price,
-            "price_raw": car.price_raw,
-            "thumb": car.thumb,
-            "status": car.status,
-        }
+        return ORJSONResponse(car_to_dict(car))
     finally:
         db.close()
 
@@ -47,44 +34,65 @@ def scrape_detail(url: str):
 def scan_urls(limit: int = Query(36, ge=12, le=100), pages: int = Query(20, ge=1, le=50)):
     return get_all_active_urls(limit=limit, max_pages=pages)
 
-@router.get("/refresh")
+@router.get("/refresh", status_code=202)
 def refresh(limit: int = Query(36, ge=12, le=100), pages: int = Query(20, ge=1, le=50)):
-    return scrape_urls_and_persist(limit=limit, max_pages=pages)
+    """Start a crawl-and-upsert job (or join the one already running) and return its id."""
+    job, created = jobs.submit(
+        "refresh",
+        scrape_urls_and_persist,
+        progress={k: 0 for k in PROGRESS_KEYS},
+        limit=limit,
+        max_pages=pages,
+    )
+    return {"job_id": job.id, "status": job.status, "deduplicated": not created}
+
+@router.get("/jobs")
+def list_jobs():
+    return [j.to_dict() for j in jobs.list()]
+
+@router.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job.to_dict()
 
 @router.get("/cars-db")
-def cars_db(limit: int = Query(200), offset: int = Query(0)):
-    db: Session = SessionLocal()
+def cars_db(
+    limit: int = Query(200, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    make: Optional[str] = None,
+    total: bool = False,
+    offset: int = Query(0, ge=0, deprecated=True, description="Removed; only 0 is accepted. Use cursor."),
+):
+    """
+    Cars straight from the DB, by id, one keyset page at a time: pass the
+    returned next_cursor back as ?cursor=. `count` is only filled in with
+    ?total=true (it costs a COUNT).
+    """
+    if offset:
+        raise HTTPException(400, "offset pagination was removed; pass next_cursor from the previous page as ?cursor=")
+    db: Session = ReadSessionLocal()
     try:
-        q = db.query(Car).order_by(Car.id.desc())
-        total = q.count()
-        rows = q.offset(offset).limit(limit).all()
-        items = [
-            {
-                "id": c.id,
-                "url": c.url,
-                "stock": c.stock,
-                "vin": c.vin,
-                "year": c.year,
-                "make": c.make,
-                "model": c.model,
-                "body_style": c.body_style,
-                "exterior_color": c.exterior_color,
-                "interior_color": c.interior_color,
-                "miles": c.miles,
-                "transmission": c.transmission,
-                "engine": c.engine,
-                "price": c.price,
-                "price_raw": c.price_raw,
-                "thumb": c.thumb,
-                "status": c.status,
-            }
-            for c in rows
-        ]
-        return {"count": total, "items": items}
+        try:
+            page = fetch_page(
+                db, CarFilters(status=status, make=make), sort="id", cursor=cursor, limit=limit, with_total=total
+            )
+        except BadCursor as e:
+            raise HTTPException(400, str(e))
+        return ORJSONResponse(
+            {"count": page.total, "items": cars_to_dicts(page.items), "next_cursor": page.next_cursor}
+        )
     finally:
         db.close()
 
 # Optional: keep frontend path working
 @router.get("/cars")
-def cars_alias(limit: int = Query(200), offset: int = Query(0)):
-    return cars_db(limit=limit, offset=offset)
+def cars_alias(
+    limit: int = Query(200, ge=1, le=500),
+    cursor: Optional[str] = None,
+    total: bool = False,
+    offset: int = Query(0, ge=0, deprecated=True, description="Removed; only 0 is accepted. Use cursor."),
+):
+    return cars_db(limit=limit, cursor=cursor, status=None, make=None, total=total, offset=offset)
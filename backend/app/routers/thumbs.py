@@ -0,0 +1,54 @@
+# backend/app/routers/thumbs.py
+from __future__ import annotations
+
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Response
+
+from app.db import ReadSessionLocal
+from app.models.car import Car
+from app.utils.sticker_cache import etag_matches
+from app.utils.thumb_prefetch import prefetcher
+from app.utils.thumbs import FORMATS, ThumbSourceError, get_thumb, thumb_version
+
+router = APIRouter(prefix="/thumbs", tags=["thumbs"])
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+SHORT = "public, max-age=300"
+
+
+@router.get("/metrics")
+def thumb_metrics():
+    """Scrape-driven prefetch counters and per-image fetch/processing timings."""
+    return prefetcher.metrics()
+
+
+@router.get("/{car_id}")
+def car_thumb(
+    car_id: int,
+    size: str = Query("grid", pattern="^(grid|detail)$"),
+    fmt: str = Query("webp", pattern="^(webp|jpeg)$"),
+    v: Optional[str] = Query(None, description="Source version from thumb_path(); makes the response immutable"),
+    if_none_match: Optional[str] = Header(None),
+):
+    """Resized first photo of a car, served from the local derivative cache."""
+    db = ReadSessionLocal()
+    try:
+        src = db.query(Car.thumb).filter(Car.id == car_id).scalar()
+    finally:
+        db.close()
+    if not src:
+        raise HTTPException(status_code=404, detail="Car has no photo")
+
+    version = thumb_version(src)
+    etag = f'"{version}-{size}.{fmt}"'
+    # a stale ?v= (photo changed since the page was built) still gets the current image, just not forever
+    headers = {"Cache-Control": IMMUTABLE if v == version else SHORT, "ETag": etag}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        data = get_thumb(src, size, fmt)
+    except ThumbSourceError as e:
+        raise HTTPException(status_code=502, detail=f"Photo unavailable: {e}")
+    return Response(content=data, media_type=FORMATS[fmt].media_type, headers=headers)
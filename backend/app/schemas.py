@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, List, Tuple
+from typing import Literal, Optional, List, Tuple, Union
 
 class ServiceItemIn(BaseModel):
     description: str
@@ -24,9 +24,19 @@ class CarIn(BaseModel):
     price: Optional[float] = None
     status: Optional[str] = "available"
 
-class CarOut(CarIn):
+class CarSummaryOut(CarIn):
     id: int
+    class Config:
+        from_attributes = True
+
+class CarOut(CarSummaryOut):
     services: List[ServiceItemOut] = []
+
+class CarPageOut(BaseModel):
+    items: List[Union[CarOut, CarSummaryOut]]  # CarOut only with ?include=services
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page; null on the last one
+    total: Optional[int] = None
+    total_is_estimate: bool = False
     class Config:
         from_attributes = True
 
@@ -37,3 +47,10 @@ class PricingEstimate(BaseModel):
     target_buy_high: float
     est_recon_cost: float
     est_profit_range: Tuple[float, float]
+
+class StickerBatchIn(BaseModel):
+    ids: List[int] = []
+    urls: List[str] = []
+    status: Optional[str] = None
+    make: Optional[str] = None
+    format: Literal["zip", "pdf"] = "zip"
@@ -0,0 +1,102 @@
+# backend/app/utils/car_ingest.py
+"""
+Bulk car upserts for POST /cars/bulk.
+
+Items are applied in chunks: one SELECT for the chunk's URLs, then every
+create/update in one transaction. Each item gets its own result
+(created / updated / unchanged / error). Like upsert_car, only the fields
+an item actually sends are written, so partial updates
+(e.g. {"url": ..., "status": "sold"}) don't blank the rest.
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.models.car import Car
+from app.schemas import CarIn
+from app.utils.sticker_prerender import mark_changed
+
+BULK_CHUNK_SIZE = int(os.getenv("CARS_BULK_CHUNK", "200"))
+RESULT_STATUSES = ("created", "updated", "unchanged", "error")
+
+# (position in the request body, decoded item or the exception from decoding it)
+Item = Tuple[int, Any]
+
+
+def _error(index: int, url: Optional[str], message: str) -> Dict[str, Any]:
+    return {"index": index, "url": url, "status": "error", "error": message}
+
+
+def _validate(items: List[Item]) -> Tuple[List[Tuple[int, CarIn]], List[Dict[str, Any]]]:
+    valid, errors = [], []
+    for index, raw in items:
+        if isinstance(raw, Exception):
+            errors.append(_error(index, None, str(raw)))
+            continue
+        try:
+            valid.append((index, CarIn.model_validate(raw)))
+        except ValidationError as e:
+            url = raw.get("url") if isinstance(raw, dict) else None
+            errors.append(_error(index, url, "; ".join(
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()
+            )))
+    return valid, errors
+
+
+def _apply(session, cars: Dict[str, Car], index: int, payload: CarIn) -> Tuple[Dict[str, Any], Car]:
+    car = cars.get(payload.url)
+    if car is None:
+        car = Car(**payload.model_dump())
+        session.add(car)
+        cars[payload.url] = car
+        status = "created"
+    else:
+        fields = payload.model_dump(exclude_unset=True)
+        if all(getattr(car, k) == v for k, v in fields.items()):
+            status = "unchanged"
+        else:
+            for k, v in fields.items():
+                setattr(car, k, v)
+            status = "updated"
+    return {"index": index, "url": payload.url, "status": status}, car
+
+
+def _commit(session, applied: List[Tuple[Dict[str, Any], Car]]) -> None:
+    # ids are read before commit: commit expires the instances and reading
+    # them afterwards would reload every row
+    session.flush()
+    for result, car in applied:
+        result["id"] = car.id
+        if result["status"] != "unchanged":
+            mark_changed(session, car)  # sticker pre-render, scheduled on commit
+    session.commit()
+
+
+def ingest_chunk(session, items: List[Item]) -> List[Dict[str, Any]]:
+    """Upsert one chunk in one transaction; falls back to per-item commits to isolate a bad row."""
+    valid, results = _validate(items)
+    if not valid:
+        return results
+
+    try:
+        cars = {c.url: c for c in session.query(Car).filter(Car.url.in_({p.url for _, p in valid}))}
+        applied = [_apply(session, cars, i, p) for i, p in valid]
+        _commit(session, applied)
+        results.extend(r for r, _ in applied)
+    except Exception:
+        session.rollback()
+        for i, p in valid:
+            try:
+                cars = {c.url: c for c in session.query(Car).filter(Car.url == p.url)}
+                applied = [_apply(session, cars, i, p)]
+                _commit(session, applied)
+                results.append(applied[0][0])
+            except Exception as e:
+                session.rollback()
+                results.append(_error(i, p.url, f"{type(e).__name__}: {e}"))
+
+    results.sort(key=lambda r: r["index"])
+    return results
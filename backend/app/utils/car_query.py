@@ -0,0 +1,134 @@
+# backend/app/utils/car_query.py
+"""
+Keyset-paginated car listing shared by /cars/ and /scan/cars-db.
+
+Pages are addressed by an opaque cursor holding the sort key of the last row
+seen, so fetching page 50 costs the same index range scan as page 1 (no
+OFFSET walk), and no COUNT(*) runs unless a total is asked for.
+"""
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, select, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.car import Car
+
+MAX_PAGE_SIZE = 500
+# Above this many matches the total is reported as a lower bound ("10000+").
+COUNT_CAP = 10_000
+
+# sort name -> key columns, newest first
+SORTS = {
+    "created": (Car.created_at, Car.id),
+    "id": (Car.id,),
+}
+
+
+class BadCursor(ValueError):
+    pass
+
+
+@dataclass
+class CarFilters:
+    status: Optional[str] = None
+    make: Optional[str] = None
+    year_min: Optional[int] = None
+    year_max: Optional[int] = None
+    price_min: Optional[int] = None
+    price_max: Optional[int] = None
+
+    def apply(self, stmt):
+        if self.status:
+            stmt = stmt.where(func.lower(Car.status) == self.status.strip().lower())  # ix_cars_status_lower_created_at_id
+        if self.make:
+            stmt = stmt.where(func.lower(Car.make) == self.make.strip().lower())  # ix_cars_make_lower
+        if self.year_min is not None:
+            stmt = stmt.where(Car.year >= self.year_min)
+        if self.year_max is not None:
+            stmt = stmt.where(Car.year <= self.year_max)
+        if self.price_min is not None:
+            stmt = stmt.where(Car.price >= self.price_min)
+        if self.price_max is not None:
+            stmt = stmt.where(Car.price <= self.price_max)
+        return stmt
+
+
+@dataclass
+class CarPage:
+    items: List[Car]
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+
+def encode_cursor(sort: str, row: Car) -> str:
+    vals = [getattr(row, c.key) for c in SORTS[sort]]
+    raw = json.dumps([sort, [v.isoformat() if isinstance(v, datetime) else v for v in vals]])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(sort: str, cursor: str) -> Tuple:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cur_sort, vals = json.loads(raw)
+    except Exception:
+        raise BadCursor("Malformed cursor")
+    cols = SORTS[sort]
+    if cur_sort != sort or len(vals) != len(cols):
+        raise BadCursor("Cursor does not match the requested sort")
+    try:
+        return tuple(
+            datetime.fromisoformat(v) if c.type.python_type is datetime and v is not None else v
+            for c, v in zip(cols, vals)
+        )
+    except (TypeError, ValueError):
+        raise BadCursor("Malformed cursor")
+
+
+def _estimate_total(db: Session, stmt) -> Tuple[int, bool]:
+    """Planner row estimate on PostgreSQL; elsewhere an exact count capped at COUNT_CAP."""
+    bind = db.get_bind()
+    if bind.dialect.name == "postgresql":
+        sql = stmt.compile(bind, compile_kwargs={"literal_binds": True})
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"]), True
+    capped = select(func.count()).select_from(stmt.with_only_columns(Car.id).limit(COUNT_CAP + 1).subquery())
+    n = db.execute(capped).scalar_one()
+    return min(n, COUNT_CAP), n > COUNT_CAP
+
+
+def fetch_page(
+    db: Session,
+    filters: CarFilters,
+    *,
+    sort: str = "created",
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    with_total: bool = False,
+    options: Sequence = (),
+) -> CarPage:
+    """`options` are loader options for the page query (e.g. selectinload(Car.services))."""
+    cols = SORTS[sort]
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    base = filters.apply(select(Car))
+    stmt = base
+    if cursor:
+        after = decode_cursor(sort, cursor)
+        key = tuple_(*cols) if len(cols) > 1 else cols[0]
+        stmt = stmt.where(key < (tuple_(*after) if len(cols) > 1 else after[0]))
+    stmt = stmt.order_by(*(c.desc() for c in cols)).limit(limit + 1).options(*options)
+
+    rows = list(db.execute(stmt).scalars())
+    more = len(rows) > limit
+    rows = rows[:limit]
+    page = CarPage(items=rows, next_cursor=encode_cursor(sort, rows[-1]) if more else None)
+    if with_total:
+        page.total, page.total_is_estimate = _estimate_total(db, base)
+    return page
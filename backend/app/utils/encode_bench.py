@@ -0,0 +1,41 @@
+# backend/app/utils/encode_bench.py
+from __future__ import annotations
+
+import argparse
+import time
+
+from app.utils.sticker_encode import PROFILES, encode
+from app.utils.sticker_render import TEMPLATE_DPI, render_sticker_image
+
+SAMPLE = {
+    "year": "2002", "make": "Mercedes-Benz", "model": "SL-Class",
+    "vin": "WDBFA68F12F202525", "mileage": 28823,
+    "engine": "5.0L NA V8 single overhead cam (SOHC) 24V", "trans": "5-Speed Automatic",
+    "exterior_color": "Brilliant Silver Metallic", "interior_color": "Shell/Black",
+    "stock": "A2113", "price": "$48,750",
+    "url": "https://www.sportscarla.com/used-2002-mercedes-benz-sl-class-sl-500-c-1019.htm",
+}
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        prog="python -m app.utils.encode_bench",
+        description="Encode time and output size of each sticker output profile.",
+    )
+    p.add_argument("--rounds", type=int, default=10)
+    args = p.parse_args(argv)
+
+    img = render_sticker_image(SAMPLE)
+    print(f"{'profile':<10} {'encode ms':>10} {'KiB':>8}  use")
+    for name, prof in PROFILES.items():
+        data = encode(img, name, TEMPLATE_DPI)  # warm-up
+        t0 = time.perf_counter()
+        for _ in range(args.rounds):
+            encode(img, name, TEMPLATE_DPI)
+        ms = (time.perf_counter() - t0) / args.rounds * 1000
+        print(f"{name:<10} {ms:>10.2f} {len(data) / 1024:>8.1f}  {prof.description}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+# backend/app/utils/fetcher.py
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+# Defaults are deliberately polite: a handful of sockets and a few requests/sec per host.
+DEFAULT_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "8"))
+DEFAULT_RATE_PER_HOST = float(os.getenv("SCRAPE_RATE_PER_HOST", "4"))  # requests / second
+DEFAULT_TIMEOUT = float(os.getenv("SCRAPE_TIMEOUT", "25"))
+
+# The site (pages and photos alike) rejects clients without a browser-like User-Agent.
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36"
+    )
+}
+
+
+class HostRateLimiter:
+    """
+    Spaces request *starts* per host by `1 / rate` seconds.
+
+    Each caller reserves the next free slot under a short lock and then sleeps
+    outside of it, so waiting requests don't serialize on the lock itself.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, host: str) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AsyncFetcher:
+    """
+    Shared httpx.AsyncClient with bounded concurrency and per-host rate limiting.
+
+        async with AsyncFetcher() as f:
+            html = await f.get_text(url)
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        rate_per_host: float = DEFAULT_RATE_PER_HOST,
+        timeout: float = DEFAULT_TIMEOUT,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        self.concurrency = max(1, concurrency)
+        self.limiter = HostRateLimiter(rate_per_host)
+        self._sem = asyncio.Semaphore(self.concurrency)
+        self._timeout = timeout
+        self._headers = headers or {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        self._client = httpx.AsyncClient(
+            headers=self._headers,
+            timeout=self._timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        if self._client is None:
+            raise RuntimeError("AsyncFetcher must be used as an async context manager")
+        async with self._sem:
+            await self.limiter.wait(urlsplit(url).netloc)
+            return await self._client.get(url, headers=headers)
+
+    async def get_text(self, url: str) -> str:
+        r = await self.get(url)
+        r.raise_for_status()
+        return r.text
@@ -0,0 +1,76 @@
+# backend/app/utils/fit_bench.py
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from PIL import Image, ImageDraw, ImageFont
+
+from app.utils.sticker_render import DEFAULT_FONT_PATH
+from app.utils.sticker_assets import assets
+from app.utils.text_fit import fit_font, text_width
+
+# (field, text, max_width, start_size) — long values from real listings
+FIELDS = [
+    ("price", "$1,249,995 (Call for Details)", 450, 70),
+    ("engine", "5.0L NA V8 single overhead cam (SOHC) 24V with Sport Exhaust", 650, 28),
+    ("model", "911 Carrera 4S Cabriolet Heritage Design Edition", 320, 28),
+    ("vin", "WP0CB2A92KS155432", 680, 28),
+]
+
+
+def _linear_fit(draw: ImageDraw.ImageDraw, text: str, max_width: int, start: int, path: str):
+    """The previous implementation: fresh truetype load + textbbox per 1pt step."""
+    def load(size):
+        return ImageFont.truetype(path, size=size) if os.path.exists(path) else ImageFont.load_default()
+    size = start
+    font = load(size)
+    while size > 10:
+        bbox = draw.textbbox((0, 0), text, font=font)
+        if bbox[2] - bbox[0] <= max_width:
+            return font
+        size -= 1
+        font = load(size)
+    return font
+
+
+def _per_call(fn, rounds: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        prog="python -m app.utils.fit_bench",
+        description="Per-field shrink-to-fit time: linear search vs binary search + cached metrics.",
+    )
+    p.add_argument("--font", default=DEFAULT_FONT_PATH, help="TrueType font to measure with")
+    p.add_argument("--rounds", type=int, default=20)
+    args = p.parse_args(argv)
+
+    if not os.path.exists(args.font):
+        print(f"Note: {args.font} not found; using PIL's default font.", file=sys.stderr)
+    draw = ImageDraw.Draw(Image.new("RGB", (10, 10)))
+
+    def cold_fit(text, w, start):
+        assets.clear()
+        text_width.cache_clear()
+        return fit_font(text, w, start, args.font)
+
+    print(f"{'field':<8} {'linear ms':>10} {'binary cold ms':>15} {'binary warm ms':>15} {'size':>5}")
+    for name, text, w, start in FIELDS:
+        old = _per_call(lambda: _linear_fit(draw, text, w, start, args.font), args.rounds)
+        cold = _per_call(lambda: cold_fit(text, w, start), args.rounds)
+        fit_font(text, w, start, args.font)
+        warm = _per_call(lambda: fit_font(text, w, start, args.font), args.rounds * 50)
+        size = getattr(fit_font(text, w, start, args.font), "size", "-")
+        print(f"{name:<8} {old * 1000:>10.3f} {cold * 1000:>15.3f} {warm * 1000:>15.4f} {size:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
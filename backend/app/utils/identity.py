@@ -0,0 +1,139 @@
+# backend/app/utils/identity.py
+"""
+Car identity resolution: which existing row (if any) a scraped record is.
+
+Precedence is url > vin > stock. Candidates for a whole batch of lookups
+come from ONE indexed query (url unique index, ix_cars_vin_norm, ix_cars_stock).
+VIN/stock aren't unique on the site, so several rows can match; that is
+reported on the result (and logged) instead of raising mid-crawl, and the
+most recently created candidate wins.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import or_, update
+
+from app.models.car import Car
+
+log = logging.getLogger(__name__)
+
+_NON_VIN = re.compile(r"[^A-Z0-9]")
+
+
+def normalize_vin(vin: Optional[str]) -> Optional[str]:
+    """Uppercase, strip spaces/dashes/punctuation; None if nothing is left."""
+    if not vin:
+        return None
+    return _NON_VIN.sub("", vin.upper()) or None
+
+
+@dataclass
+class IdentityMatch:
+    row: Optional[object] = None  # the winning candidate (Car or (id, url, vin_norm, stock) row)
+    matched_on: Optional[str] = None  # "url" | "vin" | "stock" | None (new car)
+    candidates: List[object] = field(default_factory=list)
+
+    @property
+    def ambiguous(self) -> bool:
+        return len(self.candidates) > 1
+
+    @property
+    def url(self) -> Optional[str]:
+        return self.row.url if self.row is not None else None
+
+
+class IdentityIndex:
+    """
+    In-memory view of the candidate rows for a set of lookups.
+
+    `add()` registers rows created earlier in the same batch so later records
+    can match them, exactly as sequential upserts would have.
+    """
+
+    def __init__(self, rows: Iterable[object] = ()):
+        self.by_url: Dict[str, object] = {}
+        self.by_vin: Dict[str, List[object]] = {}
+        self.by_stock: Dict[str, List[object]] = {}
+        for r in rows:  # loaded newest first
+            self._index(r, front=False)
+
+    @classmethod
+    def load(
+        cls,
+        session,
+        urls: Iterable[str],
+        vins: Iterable[Optional[str]] = (),
+        stocks: Iterable[Optional[str]] = (),
+        entity: Sequence = (Car.id, Car.url, Car.vin_norm, Car.stock),
+    ) -> "IdentityIndex":
+        """One query for every url/vin/stock candidate, newest rows first."""
+        urls = set(urls)
+        vins = {v for v in map(normalize_vin, vins) if v}
+        stocks = {s for s in stocks if s}
+        preds = [Car.url.in_(urls)]
+        if vins:
+            preds.append(Car.vin_norm.in_(vins))
+        if stocks:
+            preds.append(Car.stock.in_(stocks))
+        q = session.query(*entity) if isinstance(entity, (list, tuple)) else session.query(entity)
+        return cls(q.filter(or_(*preds)).order_by(Car.id.desc()).all())
+
+    def add(self, row) -> None:
+        """Register a row created after loading; it is the newest candidate for its keys."""
+        self._index(row, front=True)
+
+    def _index(self, row, front: bool) -> None:
+        self.by_url.setdefault(row.url, row)
+        for key, bucket in ((row.vin_norm, self.by_vin), (row.stock, self.by_stock)):
+            if key:
+                lst = bucket.setdefault(key, [])
+                if front:
+                    lst.insert(0, row)
+                else:
+                    lst.append(row)
+
+    def resolve(self, url: str, vin: Optional[str] = None, stock: Optional[str] = None) -> IdentityMatch:
+        row = self.by_url.get(url)
+        if row is not None:
+            return IdentityMatch(row, "url", [row])
+
+        vin_n = normalize_vin(vin)
+        if vin_n and vin_n in self.by_vin:
+            return self._pick(url, "vin", self.by_vin[vin_n])
+
+        if stock and stock in self.by_stock:
+            # stock numbers get reused; a car with a *different* VIN isn't this one
+            cands = [r for r in self.by_stock[stock] if not (vin_n and r.vin_norm and r.vin_norm != vin_n)]
+            if cands:
+                return self._pick(url, "stock", cands)
+        return IdentityMatch()
+
+    @staticmethod
+    def _pick(url: str, on: str, cands: List[object]) -> IdentityMatch:
+        m = IdentityMatch(cands[0], on, list(cands))
+        if m.ambiguous:
+            log.warning(
+                "ambiguous %s match for %s: %d cars (%s); using %s",
+                on, url, len(cands), ", ".join(str(getattr(c, "id", "?")) for c in cands), m.url,
+            )
+        return m
+
+
+def resolve_car(session, url: str, vin: Optional[str] = None, stock: Optional[str] = None) -> IdentityMatch:
+    """Single-record resolution; `row` is the matched Car entity."""
+    return IdentityIndex.load(session, [url], [vin], [stock], entity=Car).resolve(url, vin, stock)
+
+
+def backfill_vin_norm(session) -> int:
+    """Fill vin_norm for rows written before the column existed."""
+    rows = session.query(Car.id, Car.vin).filter(Car.vin.isnot(None), Car.vin_norm.is_(None)).all()
+    params = [{"id": i, "vin_norm": normalize_vin(v)} for i, v in rows]
+    params = [p for p in params if p["vin_norm"]]
+    if params:
+        session.execute(update(Car), params)
+        session.commit()
+    return len(params)
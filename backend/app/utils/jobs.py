@@ -0,0 +1,113 @@
+# backend/app/utils/jobs.py
+from __future__ import annotations
+
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Finished jobs are kept around (newest first) so clients can still poll them.
+MAX_FINISHED_JOBS = 50
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str = "queued"  # queued | running | done | failed
+    progress: Dict[str, int] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def active(self) -> bool:
+        return self.status in ("queued", "running")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "progress": dict(self.progress),
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobManager:
+    """
+    In-process job runner. One job per `kind` may be in flight at a time;
+    submitting another of the same kind returns the existing job instead.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        kind: str,
+        fn: Callable[..., Optional[Dict[str, Any]]],
+        progress: Optional[Dict[str, int]] = None,
+        **params: Any,
+    ) -> Tuple[Job, bool]:
+        """
+        Queue `fn(progress=<dict>, **params)`. Returns (job, created); `created`
+        is False when an in-flight job of the same kind was reused.
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.kind == kind and job.active:
+                    return job, False
+            job = Job(id=uuid.uuid4().hex, kind=kind, params=params, progress=dict(progress or {}))
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, fn)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created_at, reverse=True)
+
+    def _run(self, job: Job, fn: Callable[..., Optional[Dict[str, Any]]]) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        try:
+            job.result = fn(progress=job.progress, **job.params)
+            job.status = "done"
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+            job.status = "failed"
+            log.exception("job %s (%s) failed", job.id, job.kind)
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    def _prune(self) -> None:
+        finished = sorted(
+            (j for j in self._jobs.values() if not j.active),
+            key=lambda j: j.created_at,
+            reverse=True,
+        )
+        for j in finished[MAX_FINISHED_JOBS:]:
+            self._jobs.pop(j.id, None)
+
+
+jobs = JobManager()
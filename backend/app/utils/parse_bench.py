@@ -0,0 +1,65 @@
+# backend/app/utils/parse_bench.py
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import sys
+import time
+from typing import Callable
+
+from app.utils.parsers import BACKENDS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "fixtures")
+
+
+def _time_per_call(fn: Callable[[], object], rounds: int) -> float:
+    fn()  # warm-up (XPath compilation, imports, caches)
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - t0) / rounds
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        prog="python -m app.utils.parse_bench",
+        description="Per-page parse time of each HTML backend over saved fixtures.",
+    )
+    p.add_argument("--fixtures", default=FIXTURES_DIR,
+                   help="Directory of detail_*.html / inventory_*.html pages")
+    p.add_argument("--rounds", type=int, default=50)
+    args = p.parse_args(argv)
+
+    files = sorted(glob.glob(os.path.join(args.fixtures, "*.html")))
+    if not files:
+        print(f"No *.html fixtures in {args.fixtures}", file=sys.stderr)
+        return 2
+
+    names = list(BACKENDS)
+    print(f"{'fixture':<28} {'KiB':>6} " + " ".join(f"{n + ' ms':>10}" for n in names) + f" {'speedup':>8}  match")
+    for path in files:
+        with open(path, encoding="utf-8") as fh:
+            html = fh.read()
+        name = os.path.basename(path)
+        is_inventory = name.startswith("inventory")
+
+        timings, outputs = [], []
+        for n in names:
+            inventory_fn, detail_fn = BACKENDS[n]
+            call = (lambda f=inventory_fn: f(html)) if is_inventory else (lambda f=detail_fn: f(html, "fixture"))
+            timings.append(_time_per_call(call, args.rounds))
+            outputs.append(call())
+
+        speedup = timings[-1] / timings[0] if timings[0] else float("inf")
+        same = all(o == outputs[0] for o in outputs[1:])
+        print(
+            f"{name:<28} {len(html) / 1024:>6.1f} "
+            + " ".join(f"{t * 1000:>10.3f}" for t in timings)
+            + f" {speedup:>7.1f}x  {'yes' if same else 'NO'}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
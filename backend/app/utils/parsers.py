@@ -0,0 +1,234 @@
+# backend/app/utils/parsers.py
+"""
+HTML parsing backends for the SportscarLA inventory feed and detail pages.
+
+`lxml` is the fast path: one C-level parse plus precompiled XPath. The
+BeautifulSoup versions are kept as the reference implementation and as a
+fallback whenever the fast path finds nothing (markup drift, parse errors).
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+from lxml import etree, html as lxml_html
+
+BASE = "https://www.sportscarla.com"
+
+# (detail_url, is_sold) per inventory card
+Card = Tuple[Optional[str], bool]
+Detail = Dict[str, Optional[str]]
+
+
+def empty_detail(url: str) -> Detail:
+    return {
+        "url": url,
+        "year": "", "make": "", "model": "",
+        "exterior_color": "", "interior_color": "",
+        "stock": "", "vin": "",
+        "miles": "", "transmission": "", "engine": "",
+        "price": "", "body_style": "",
+        "thumb": None,
+    }
+
+
+def _apply_label(data: Detail, label: str, value: str) -> None:
+    """Map one `.elm` label/value pair onto the detail record."""
+    if "year" in label:
+        data["year"] = value
+    elif "make" in label:
+        data["make"] = value
+    elif "model" in label:
+        data["model"] = value
+    elif label in ("vin",):
+        data["vin"] = value
+    elif "mile" in label or "odometer" in label:
+        data["miles"] = value
+    elif "transmission" in label:
+        data["transmission"] = value
+    elif "engine" in label:
+        data["engine"] = value
+    elif "exterior" in label:
+        data["exterior_color"] = value
+    elif "interior" in label:
+        data["interior_color"] = value
+    elif "stock" in label:
+        data["stock"] = value
+    elif "price" in label:
+        data["price"] = value
+    elif "body" in label and "style" in label:
+        data["body_style"] = value
+
+
+def _value_after_label(label: str, text: str) -> str:
+    return text[len(label):].lstrip(" :\u00A0") if text.lower().startswith(label) else text
+
+
+# ---------- BeautifulSoup (reference / fallback) ----------
+
+def _bs4_is_sold(card: BeautifulSoup) -> bool:
+    if card.select_one('img.overlay[alt*="Sold" i], img.overlay[alt*="Pending" i]'):
+        return True
+    price = card.select_one(".price")
+    if price and any(x in price.get_text(" ", strip=True).lower() for x in ("sold", "pending", "sale pending")):
+        return True
+    return False
+
+def _bs4_detail_url(card: BeautifulSoup) -> Optional[str]:
+    a = (card.select_one(".vehicle_secp a[href]") or
+         card.select_one(".hideBox a[href]") or
+         card.select_one("a[href]"))
+    return urljoin(BASE, a["href"]) if a and a.get("href") else None
+
+def bs4_inventory(html: str) -> List[Card]:
+    soup = BeautifulSoup(html, "html.parser")
+    return [(_bs4_detail_url(c), _bs4_is_sold(c)) for c in soup.select("div.car-col div.item")]
+
+def bs4_detail(html: str, url: str) -> Detail:
+    soup = BeautifulSoup(html, "html.parser")
+    data = empty_detail(url)
+
+    # first actual photo from div#photos
+    photo_a = soup.select_one("div#photos div.photo a[href]")
+    if photo_a and photo_a.get("href"):
+        data["thumb"] = urljoin(BASE, photo_a["href"])
+    else:
+        # fallback (previous logic, in case structure changes)
+        hero = (
+            soup.select_one("img#mainImage")
+            or soup.select_one(".vehicle-image img")
+            or soup.select_one("img.full")
+            or soup.select_one("img[src*='imagetag']")
+        )
+        if hero and hero.get("src"):
+            src = hero["src"]
+            data["thumb"] = urljoin(BASE, src) if src.startswith("/") else src
+
+    for elm in soup.select(".elm"):
+        span = elm.find("span")
+        if not span:
+            continue
+        label = span.get_text(strip=True).rstrip(":").lower()
+        value = (span.next_sibling or "").strip() if span.next_sibling else ""
+        if not value:
+            value = _value_after_label(label, elm.get_text(" ", strip=True))
+        _apply_label(data, label, value)
+
+    return data
+
+
+# ---------- lxml (fast path) ----------
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_X_CARDS = etree.XPath(f"//div[{_has_class('car-col')}]//div[{_has_class('item')}]")
+_X_SOLD_OVERLAY = etree.XPath(
+    f".//img[{_has_class('overlay')}]"
+    "[contains(translate(@alt, 'SOLDPENDING', 'soldpending'), 'sold')"
+    " or contains(translate(@alt, 'SOLDPENDING', 'soldpending'), 'pending')]"
+)
+_X_PRICE = etree.XPath(f"(.//*[{_has_class('price')}])[1]")
+_X_CARD_LINKS = (
+    etree.XPath(f"(.//*[{_has_class('vehicle_secp')}]//a[@href])[1]/@href"),
+    etree.XPath(f"(.//*[{_has_class('hideBox')}]//a[@href])[1]/@href"),
+    etree.XPath("(.//a[@href])[1]/@href"),
+)
+
+_X_PHOTO_HREF = etree.XPath(f"(//div[@id='photos']//div[{_has_class('photo')}]//a[@href])[1]/@href")
+_X_HERO_IMGS = (
+    etree.XPath("(//img[@id='mainImage'])[1]"),
+    etree.XPath(f"(//*[{_has_class('vehicle-image')}]//img)[1]"),
+    etree.XPath(f"(//img[{_has_class('full')}])[1]"),
+    etree.XPath("(//img[contains(@src, 'imagetag')])[1]"),
+)
+_X_ELMS = etree.XPath(f"//*[{_has_class('elm')}]")
+_X_FIRST_SPAN = etree.XPath("(.//span)[1]")
+_X_TEXT = etree.XPath(".//text()")
+
+
+def _joined_text(el, sep: str) -> str:
+    return sep.join(t.strip() for t in _X_TEXT(el) if t.strip())
+
+def _lxml_root(html: str):
+    return lxml_html.fromstring(html)
+
+def lxml_inventory(html: str) -> List[Card]:
+    root = _lxml_root(html)
+    cards: List[Card] = []
+    for card in _X_CARDS(root):
+        sold = bool(_X_SOLD_OVERLAY(card))
+        if not sold:
+            price = _X_PRICE(card)
+            if price:
+                ptxt = _joined_text(price[0], " ").lower()
+                sold = any(x in ptxt for x in ("sold", "pending", "sale pending"))
+        href = None
+        for xp in _X_CARD_LINKS:
+            hit = xp(card)
+            if hit:
+                href = str(hit[0])
+                break
+        cards.append((urljoin(BASE, href) if href else None, sold))
+    return cards
+
+def lxml_detail(html: str, url: str) -> Detail:
+    root = _lxml_root(html)
+    data = empty_detail(url)
+
+    href = _X_PHOTO_HREF(root)
+    if href and href[0]:
+        data["thumb"] = urljoin(BASE, str(href[0]))
+    else:
+        for xp in _X_HERO_IMGS:
+            hit = xp(root)
+            if hit:
+                src = hit[0].get("src")
+                if src:
+                    data["thumb"] = urljoin(BASE, src) if src.startswith("/") else str(src)
+                break
+
+    for elm in _X_ELMS(root):
+        span = _X_FIRST_SPAN(elm)
+        if not span:
+            continue
+        span = span[0]
+        label = _joined_text(span, "").rstrip(":").lower()
+        value = (span.tail or "").strip()
+        if not value:
+            value = _value_after_label(label, _joined_text(elm, " "))
+        _apply_label(data, label, value)
+
+    return data
+
+
+# ---------- public entry points ----------
+
+def _detail_is_empty(data: Detail) -> bool:
+    return not data.get("thumb") and not any(
+        v for k, v in data.items() if k not in ("url", "thumb")
+    )
+
+BACKENDS: Dict[str, Tuple[Callable[[str], List[Card]], Callable[[str, str], Detail]]] = {
+    "lxml": (lxml_inventory, lxml_detail),
+    "bs4": (bs4_inventory, bs4_detail),
+}
+
+def parse_inventory(html: str) -> List[Card]:
+    """Inventory feed cards via lxml; falls back to BeautifulSoup if lxml finds none."""
+    try:
+        cards = lxml_inventory(html)
+    except (etree.ParserError, ValueError):
+        cards = []
+    return cards or bs4_inventory(html)
+
+def parse_detail(html: str, url: str) -> Detail:
+    """Detail-page record via lxml; falls back to BeautifulSoup if lxml extracts nothing."""
+    try:
+        data = lxml_detail(html, url)
+    except (etree.ParserError, ValueError):
+        data = None
+    if data is None or _detail_is_empty(data):
+        return bs4_detail(html, url)
+    return data
@@ -0,0 +1,124 @@
+# backend/app/utils/pdf_stream.py
+"""
+Minimal incremental PDF writer: one full-bleed image per page.
+
+Each call returns the bytes to send next, so a multi-page PDF can be
+streamed while pages are still being rendered. PNGs are embedded without
+re-encoding: an 8-bit, non-interlaced PNG's IDAT stream is already valid
+PDF /FlateDecode data with PNG predictors.
+"""
+from __future__ import annotations
+
+import struct
+import zlib
+from io import BytesIO
+from typing import List, Optional, Tuple
+
+from PIL import Image
+
+_PNG_SIG = b"\x89PNG\r\n\x1a\n"
+
+
+def _png_flate(png: bytes) -> Optional[Tuple[int, int, int, bytes]]:
+    """(width, height, colors, idat) for 8-bit gray/RGB non-interlaced PNGs; else None."""
+    if not png.startswith(_PNG_SIG):
+        return None
+    pos, idat = len(_PNG_SIG), []
+    width = height = colors = None
+    while pos + 8 <= len(png):
+        length, ctype = struct.unpack(">I4s", png[pos:pos + 8])
+        data = png[pos + 8:pos + 8 + length]
+        if ctype == b"IHDR":
+            width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", data)
+            colors = {0: 1, 2: 3}.get(color_type)
+            if depth != 8 or colors is None or interlace:
+                return None
+        elif ctype == b"IDAT":
+            idat.append(data)
+        elif ctype == b"IEND":
+            break
+        pos += 12 + length
+    if not (width and height and idat):
+        return None
+    return width, height, colors, b"".join(idat)
+
+
+class StreamingPdfWriter:
+    """
+        w = StreamingPdfWriter(dpi=96)
+        yield w.begin()
+        for png in pages: yield w.add_png(png)
+        yield w.finish()
+    """
+
+    _PAGES_OBJ = 2  # reserved; the page tree is written last, once all kids are known
+
+    def __init__(self, dpi: float = 96.0):
+        self.dpi = dpi
+        self._offsets = {}
+        self._pos = 0
+        self._next_obj = 3
+        self._kids: List[int] = []
+
+    def _obj(self, num: int, body: bytes, stream: Optional[bytes] = None) -> bytes:
+        self._offsets[num] = self._pos
+        out = b"%d 0 obj\n" % num + body
+        if stream is not None:
+            out += b"\nstream\n" + stream + b"\nendstream"
+        out += b"\nendobj\n"
+        self._pos += len(out)
+        return out
+
+    def _alloc(self) -> int:
+        n = self._next_obj
+        self._next_obj += 1
+        return n
+
+    def begin(self) -> bytes:
+        head = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+        self._pos = len(head)
+        return head + self._obj(1, b"<< /Type /Catalog /Pages %d 0 R >>" % self._PAGES_OBJ)
+
+    def add_png(self, png: bytes) -> bytes:
+        info = _png_flate(png)
+        if info is not None:
+            w, h, colors, data = info
+            parms = b" /DecodeParms << /Predictor 15 /Colors %d /BitsPerComponent 8 /Columns %d >>" % (colors, w)
+        else:
+            with Image.open(BytesIO(png)) as im:
+                rgb = im.convert("RGB")
+            w, h, colors = rgb.width, rgb.height, 3
+            data, parms = zlib.compress(rgb.tobytes(), 6), b""
+        space = b"/DeviceRGB" if colors == 3 else b"/DeviceGray"
+
+        img_n, content_n, page_n = self._alloc(), self._alloc(), self._alloc()
+        pw, ph = w * 72.0 / self.dpi, h * 72.0 / self.dpi
+        content = b"q %.2f 0 0 %.2f 0 0 cm /Im0 Do Q" % (pw, ph)
+
+        out = self._obj(
+            img_n,
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace %s"
+            b" /BitsPerComponent 8 /Filter /FlateDecode%s /Length %d >>" % (w, h, space, parms, len(data)),
+            data,
+        )
+        out += self._obj(content_n, b"<< /Length %d >>" % len(content), content)
+        out += self._obj(
+            page_n,
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f]"
+            b" /Resources << /XObject << /Im0 %d 0 R >> >> /Contents %d 0 R >>"
+            % (self._PAGES_OBJ, pw, ph, img_n, content_n),
+        )
+        self._kids.append(page_n)
+        return out
+
+    def finish(self) -> bytes:
+        kids = b" ".join(b"%d 0 R" % k for k in self._kids)
+        out = self._obj(self._PAGES_OBJ, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(self._kids)))
+        xref_at = self._pos
+        size = self._next_obj
+        xref = [b"xref\n0 %d\n" % size, b"0000000000 65535 f \n"]
+        for n in range(1, size):
+            xref.append(b"%010d 00000 n \n" % self._offsets[n])
+        out += b"".join(xref)
+        out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_at)
+        return out
@@ -0,0 +1,38 @@
+# backend/app/utils/qr_cache.py
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+import qrcode
+from PIL import Image
+
+QR_SIZE = 100   # px on the sticker
+QR_BORDER = 4   # quiet-zone modules, same as qrcode.make()
+
+
+def qr_matrix(data: str, border: int = QR_BORDER) -> np.ndarray:
+    """Boolean module matrix (True = dark), quiet zone included."""
+    qr = qrcode.QRCode(border=border)
+    qr.add_data(data)
+    qr.make(fit=True)
+    return np.asarray(qr.get_matrix(), dtype=bool)
+
+
+def scale_nearest(matrix: np.ndarray, size: int) -> np.ndarray:
+    """Nearest-neighbour expand/shrink an n x n module matrix to size x size pixels."""
+    n = matrix.shape[0]
+    # sample at pixel centres, like PIL's NEAREST resize
+    idx = ((2 * np.arange(size) + 1) * n) // (2 * size)
+    return matrix[np.ix_(idx, idx)]
+
+
+@lru_cache(maxsize=1024)
+def qr_image(data: str, size: int = QR_SIZE, border: int = QR_BORDER) -> Image.Image:
+    """
+    Ready-to-paste grayscale QR bitmap for `data`, built once per (data, size).
+
+    Callers must treat the result as read-only (Image.paste only reads it).
+    """
+    pixels = np.where(scale_nearest(qr_matrix(data, border), size), 0, 255).astype(np.uint8)
+    return Image.fromarray(pixels)  # 2-D uint8 -> mode "L"
@@ -0,0 +1,149 @@
+# backend/app/utils/render_pool.py
+"""
+Dedicated process pool for sticker rendering.
+
+Pillow work runs in worker processes (each with the template and fonts
+already decoded), so sticker spikes don't hold the GIL or the API's
+threadpool hostage. Admission is bounded: once `workers + queue` renders
+are in flight, new interactive requests are rejected (HTTP 503) instead of
+piling up, and background callers (batches, pre-render) wait for a slot.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+RENDER_WORKERS = int(os.getenv("STICKER_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+RENDER_QUEUE = int(os.getenv("STICKER_RENDER_QUEUE", "16"))  # waiting slots beyond the workers
+RENDER_TIMEOUT = float(os.getenv("STICKER_RENDER_TIMEOUT", "20"))
+
+
+class RenderPoolFull(Exception):
+    pass
+
+
+def _warm_worker() -> None:
+    """Pool initializer: decode the template and load the common font sizes once."""
+    from app.utils.sticker_assets import assets
+    from app.utils.sticker_render import DEFAULT_FONT_PATH, TEMPLATE_PATH
+    from app.utils.text_fit import MIN_FONT_SIZE
+
+    try:
+        assets.template(TEMPLATE_PATH)
+    except FileNotFoundError:
+        pass  # surfaced per render with a proper message
+    for size in range(MIN_FONT_SIZE, 71):
+        assets.font(DEFAULT_FONT_PATH, size)
+
+
+def _render_job(payload: dict, profile: str) -> Tuple[bytes, float]:
+    from app.utils.sticker_render import render_sticker
+
+    t0 = time.perf_counter()
+    data = render_sticker(payload, profile)
+    return data, (time.perf_counter() - t0) * 1000
+
+
+def _pct(values, q: float) -> Optional[float]:
+    if not values:
+        return None
+    s = sorted(values)
+    return round(s[min(len(s) - 1, int(q * len(s)))], 2)
+
+
+class RenderPool:
+    def __init__(self, workers: int = RENDER_WORKERS, queue: int = RENDER_QUEUE):
+        self.workers = max(1, workers)
+        self.capacity = self.workers + max(0, queue)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counts: Dict[str, int] = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0, "timeouts": 0}
+        self._render_ms: deque = deque(maxlen=512)
+        self._total_ms: deque = deque(maxlen=512)
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+            return self._executor
+
+    def submit(self, payload: dict, profile: str = "png", wait: Optional[float] = 0) -> Future:
+        """
+        Queue a render. Raises RenderPoolFull when no slot frees up within
+        `wait` seconds (0: fail immediately, None: wait as long as it takes).
+        """
+        acquired = self._slots.acquire(blocking=False) if wait == 0 else self._slots.acquire(timeout=wait)
+        if not acquired:
+            with self._lock:
+                self._counts["rejected"] += 1
+            raise RenderPoolFull(f"{self.capacity} sticker renders already queued")
+        try:
+            fut = self.executor.submit(_render_job, payload, profile)
+        except Exception:
+            self._slots.release()
+            raise
+        t0 = time.perf_counter()
+        with self._lock:
+            self._counts["submitted"] += 1
+            self._in_flight += 1
+        fut.add_done_callback(lambda f: self._done(f, t0))
+        return fut
+
+    def render(self, payload: dict, profile: str = "png", timeout: float = RENDER_TIMEOUT) -> bytes:
+        """Blocking render through the pool (call from a threadpool thread, not the event loop)."""
+        fut = self.submit(payload, profile)
+        try:
+            data, _ = fut.result(timeout=timeout)
+        except TimeoutError:
+            with self._lock:
+                self._counts["timeouts"] += 1
+            raise
+        return data
+
+    def _done(self, fut: Future, t0: float) -> None:
+        self._slots.release()
+        total = (time.perf_counter() - t0) * 1000
+        with self._lock:
+            self._in_flight -= 1
+            if fut.cancelled() or fut.exception() is not None:
+                self._counts["failed"] += 1
+                return
+            self._counts["completed"] += 1
+            self._render_ms.append(fut.result()[1])
+            self._total_ms.append(total)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes (queued renders are cancelled); the next submit starts a new pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            render, total = list(self._render_ms), list(self._total_ms)
+            return {
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                **self._counts,
+                "render_ms_p50": _pct(render, 0.50),
+                "render_ms_p95": _pct(render, 0.95),
+                "total_ms_p50": _pct(total, 0.50),   # includes queueing + IPC
+                "total_ms_p95": _pct(total, 0.95),
+            }
+
+
+render_pool = RenderPool()
@@ -1,15 +1,28 @@
 # backend/app/utils/scraper.py
 from __future__ import annotations
+import asyncio
+import hashlib
+import json
+import logging
 import re
-import time
-from typing import List, Dict, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, List, Dict, NamedTuple, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 
-from app.db import SessionLocal
+from sqlalchemy import func
+
+from app.db import ReadSessionLocal, SessionLocal
 from app.models.car import Car
+from app.models.fetch_state import FetchState
+from app.utils.identity import IdentityIndex, IdentityMatch, normalize_vin, resolve_car
+from app.utils.fetcher import AsyncFetcher, DEFAULT_CONCURRENCY, DEFAULT_RATE_PER_HOST, HEADERS
+from app.utils.parsers import parse_detail, parse_inventory
+from app.utils.sticker_prerender import mark_changed, sticker_fields
+from app.utils.thumb_prefetch import mark_thumb
+
+log = logging.getLogger(__name__)
 
 BASE = "https://www.sportscarla.com"
 XHR_URL = (
@@ -17,62 +30,43 @@ XHR_URL = (
     "?module=inventory&sold=365_days&main=&limit={limit}&orderby=sold&offset={offset}"
 )
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0 Safari/537.36"
-    )
-}
-
 # ---------- URL collection (inventory) ----------
 
-def _is_sold(card: BeautifulSoup) -> bool:
-    if card.select_one('img.overlay[alt*="Sold" i], img.overlay[alt*="Pending" i]'):
-        return True
-    price = card.select_one(".price")
-    if price and any(x in price.get_text(" ", strip=True).lower() for x in ("sold", "pending", "sale pending")):
-        return True
-    return False
-
-def _extract_detail_url(card: BeautifulSoup) -> Optional[str]:
-    a = (card.select_one(".vehicle_secp a[href]") or
-         card.select_one(".hideBox a[href]") or
-         card.select_one("a[href]"))
-    return urljoin(BASE, a["href"]) if a and a.get("href") else None
-
-def get_all_active_urls(limit: int = 36, max_pages: int = 25, delay_sec: float = 0.25) -> List[str]:
-    urls: List[str] = []
+async def iter_active_urls(
+    fetcher: AsyncFetcher, limit: int = 36, max_pages: int = 25
+) -> AsyncIterator[str]:
+    """Yield active (non-sold) detail URLs page by page as the inventory feed is walked."""
     seen = set()
 
     for page in range(max_pages):
         offset = page * limit
         feed = XHR_URL.format(limit=limit, offset=offset)
-        html = requests.get(feed, headers=HEADERS, timeout=20).text.strip()
+        html = (await fetcher.get_text(feed)).strip()
         if not html:
             break
 
-        soup = BeautifulSoup(html, "html.parser")
-        cards = soup.select("div.car-col div.item")
+        cards = parse_inventory(html)
         if not cards:
             break
 
         added = 0
-        for card in cards:
-            if _is_sold(card):
+        for u, sold in cards:
+            if sold:
                 continue
-            u = _extract_detail_url(card)
             if not u or u in seen:
                 continue
             seen.add(u)
-            urls.append(u)
             added += 1
+            yield u
 
         if added == 0:
             break
-        if delay_sec:
-            time.sleep(delay_sec)
 
-    return urls
+def get_all_active_urls(limit: int = 36, max_pages: int = 25) -> List[str]:
+    async def collect() -> List[str]:
+        async with AsyncFetcher(headers=HEADERS) as fetcher:
+            return [u async for u in iter_active_urls(fetcher, limit=limit, max_pages=max_pages)]
+    return asyncio.run(collect())
 
 # ---------- Detail page scraper ----------
 
@@ -92,71 +86,10 @@ def _parse_price_to_int(price_str: Optional[str]) -> Optional[int]:
 
 def scrape_car_detail(url: str) -> Dict[str, Optional[str]]:
     html = requests.get(url, headers=HEADERS, timeout=25).text
-    soup = BeautifulSoup(html, "html.parser")
-
-    data = {
-        "url": url,
-        "year": "", "make": "", "model": "",
-        "exterior_color": "", "interior_color": "",
-        "stock": "", "vin": "",
-        "miles": "", "transmission": "", "engine": "",
-        "price": "", "body_style": "",
-        "thumb": None,
-    }
+    return parse_car_detail(html, url)
 
-    # ✅ FIX: grab first actual photo from div#photos
-    photo_a = soup.select_one("div#photos div.photo a[href]")
-    if photo_a and photo_a.get("href"):
-        data["thumb"] = urljoin(BASE, photo_a["href"])
-    else:
-        # fallback (previous logic, in case structure changes)
-        hero = (
-            soup.select_one("img#mainImage")
-            or soup.select_one(".vehicle-image img")
-            or soup.select_one("img.full")
-            or soup.select_one("img[src*='imagetag']")
-        )
-        if hero and hero.get("src"):
-            src = hero["src"]
-            data["thumb"] = urljoin(BASE, src) if src.startswith("/") else src
-
-    # ---------- rest of your parsing (elm blocks, etc.) ----------
-    for elm in soup.select(".elm"):
-        span = elm.find("span")
-        if not span:
-            continue
-        label = span.get_text(strip=True).rstrip(":").lower()
-        value = (span.next_sibling or "").strip() if span.next_sibling else ""
-        if not value:
-            text = elm.get_text(" ", strip=True)
-            value = text[len(label):].lstrip(" :\u00A0") if text.lower().startswith(label) else text
-
-        if "year" in label:
-            data["year"] = value
-        elif "make" in label:
-            data["make"] = value
-        elif "model" in label:
-            data["model"] = value
-        elif label in ("vin",):
-            data["vin"] = value
-        elif "mile" in label or "odometer" in label:
-            data["miles"] = value
-        elif "transmission" in label:
-            data["transmission"] = value
-        elif "engine" in label:
-            data["engine"] = value
-        elif "exterior" in label:
-            data["exterior_color"] = value
-        elif "interior" in label:
-            data["interior_color"] = value
-        elif "stock" in label:
-            data["stock"] = value
-        elif "price" in label:
-            data["price"] = value
-        elif "body" in label and "style" in label:
-            data["body_style"] = value
-
-    return data
+def parse_car_detail(html: str, url: str) -> Dict[str, Optional[str]]:
+    return parse_detail(html, url)
 
 
 # ---------- Persist (upsert) ----------
@@ -167,66 +100,395 @@ def _to_int_or_none(s: Optional[str]) -> Optional[int]:
     ss = re.sub(r"[^\d]", "", s)
     return int(ss) if ss.isdigit() else None
 
+def _car_values(detail: Dict[str, Optional[str]]) -> Dict[str, object]:
+    """Scraped detail -> Car column values. Empty/zero values become None ("keep existing")."""
+    values = {
+        "vin": detail.get("vin"),
+        "vin_norm": normalize_vin(detail.get("vin")),
+        "stock": detail.get("stock"),
+        "year": _to_int_or_none(detail.get("year")),
+        "make": detail.get("make"),
+        "model": detail.get("model"),
+        "body_style": detail.get("body_style"),
+        "exterior_color": detail.get("exterior_color"),
+        "interior_color": detail.get("interior_color"),
+        "miles": _to_int_or_none(detail.get("miles")),
+        "transmission": detail.get("transmission"),
+        "engine": detail.get("engine"),
+        "price_raw": detail.get("price"),
+        "price": _parse_price_to_int(detail.get("price")),
+        "thumb": detail.get("thumb"),
+    }
+    return {k: (v or None) for k, v in values.items()}
+
+CAR_VALUE_COLUMNS = tuple(_car_values({}).keys())
+
 def upsert_car(session, detail: Dict[str, Optional[str]]) -> Car:
     """
     Upsert by URL (primary) and prefer VIN/stock if present for updates.
     """
+    return _upsert_one(session, detail)[0]
+
+def _upsert_one(session, detail: Dict[str, Optional[str]]) -> Tuple[Car, IdentityMatch]:
     url = detail["url"]
-    car = session.query(Car).filter_by(url=url).one_or_none()
-    if not car and detail.get("vin"):
-        car = session.query(Car).filter_by(vin=detail["vin"]).one_or_none()
-    if not car and detail.get("stock"):
-        car = session.query(Car).filter_by(stock=detail["stock"]).one_or_none()
+    match = resolve_car(session, url, detail.get("vin"), detail.get("stock"))
+    car = match.row
 
+    before = sticker_fields(car) if car else None
+    thumb_before = car.thumb if car else None
     if not car:
         car = Car(url=url)
         session.add(car)
 
     # map fields
-    car.vin = detail.get("vin") or car.vin
-    car.stock = detail.get("stock") or car.stock
-    car.year = _to_int_or_none(detail.get("year")) or car.year
-    car.make = detail.get("make") or car.make
-    car.model = detail.get("model") or car.model
-    car.body_style = detail.get("body_style") or car.body_style
-    car.exterior_color = detail.get("exterior_color") or car.exterior_color
-    car.interior_color = detail.get("interior_color") or car.interior_color
-    car.miles = _to_int_or_none(detail.get("miles")) or car.miles
-    car.transmission = detail.get("transmission") or car.transmission
-    car.engine = detail.get("engine") or car.engine
-    car.price_raw = detail.get("price") or car.price_raw
-    car.price = _parse_price_to_int(detail.get("price")) or car.price
-    car.thumb = detail.get("thumb") or car.thumb
-
-    return car
-
-def scrape_urls_and_persist(limit: int = 36, max_pages: int = 25, delay_each: float = 0.15) -> Dict[str, int]:
+    for key, value in _car_values(detail).items():
+        if value is not None:
+            setattr(car, key, value)
+
+    # new car or different sticker text -> pre-render once the caller commits
+    if sticker_fields(car) != before:
+        mark_changed(session, car)
+    if car.thumb != thumb_before:
+        mark_thumb(session, car.thumb)
+    return car, match
+
+# ---------- Bulk upsert ----------
+
+BULK_BATCH_SIZE = 100
+
+def _dialect_insert(session):
+    name = session.get_bind().dialect.name
+    if name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        return None
+    return insert
+
+class _PendingCar(NamedTuple):
+    url: str
+    vin_norm: Optional[str]
+    stock: Optional[str]
+    id: Optional[int] = None
+
+def _resolve_batch(session, rows: List[Dict[str, object]]) -> Tuple[int, int, int]:
+    """
+    Point each row at the URL of the car it should update, with the same
+    url > vin > stock precedence as upsert_car, using ONE query for the batch.
+    Rows resolving to the same car are merged (later non-null values win).
+    Mutates/compacts `rows` in place; returns (created, updated, ambiguous)
+    counted per input row, as sequential upsert_car calls would have.
     """
-    1) Collect all active listing URLs.
-    2) Scrape each detail page.
-    3) Upsert into DB.
+    index = IdentityIndex.load(
+        session, [r["url"] for r in rows], [r["vin"] for r in rows], [r["stock"] for r in rows]
+    )
+    created = updated = ambiguous = 0
+    merged: Dict[str, Dict[str, object]] = {}
+    for r in rows:
+        match = index.resolve(r["url"], r["vin"], r["stock"])
+        ambiguous += match.ambiguous
+        if match.row is not None:
+            target = match.url
+            updated += 1
+        else:
+            target = r["url"]
+            created += 1
+            # later rows in this batch can match cars created earlier in it
+            index.add(_PendingCar(r["url"], r["vin_norm"], r["stock"]))
+
+        if target in merged:
+            prev = merged[target]
+            prev.update({k: v for k, v in r.items() if v is not None and k != "url"})
+        else:
+            merged[target] = {**r, "url": target}
+
+    rows[:] = list(merged.values())
+    return created, updated, ambiguous
+
+def upsert_cars_bulk(session, details: List[Dict[str, Optional[str]]]) -> Dict[str, int]:
     """
-    urls = get_all_active_urls(limit=limit, max_pages=max_pages)
-    created, updated, errors = 0, 0, 0
+    Batched counterpart of upsert_car: one identity query and one
+    INSERT ... ON CONFLICT (url) DO UPDATE per batch, then a single commit.
+    Existing columns are only overwritten by non-empty scraped values.
 
-    db = SessionLocal()
-    try:
-        for i, url in enumerate(urls, 1):
+    Falls back to per-row upsert_car on dialects without ON CONFLICT or if
+    the batch statement fails (so one bad row can't sink the others).
+    """
+    created = updated = errors = ambiguous = 0
+    insert = _dialect_insert(session)
+
+    for i in range(0, len(details), BULK_BATCH_SIZE):
+        chunk = details[i:i + BULK_BATCH_SIZE]
+        if insert is not None:
             try:
-                detail = scrape_car_detail(url)
-                before = db.query(Car).filter_by(url=url).one_or_none()
-                car = upsert_car(db, detail)
-                db.commit()
-                if before is None:
+                rows = [{"url": d["url"], **_car_values(d)} for d in chunk]
+                n_created, n_updated, n_ambiguous = _resolve_batch(session, rows)
+                now = datetime.utcnow()
+                for r in rows:
+                    r["created_at"] = now
+                    r["updated_at"] = now
+
+                stmt = insert(Car.__table__)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Car.__table__.c.url],
+                    set_={
+                        **{
+                            c: func.coalesce(stmt.excluded[c], Car.__table__.c[c])
+                            for c in CAR_VALUE_COLUMNS
+                        },
+                        "updated_at": stmt.excluded.updated_at,
+                    },
+                )
+                session.execute(stmt, rows)
+                # Queued for pre-render on commit (inside this transaction, so the
+                # writer doesn't reopen one). The sticker cache key hashes the drawn
+                # fields, so cars whose sticker text didn't change are skipped as cached.
+                for car in session.query(Car).filter(Car.url.in_([r["url"] for r in rows])):
+                    mark_changed(session, car)
+                    # already-cached photos are skipped by the prefetcher without a download
+                    mark_thumb(session, car.thumb)
+                session.commit()
+                created += n_created
+                updated += n_updated
+                ambiguous += n_ambiguous
+                continue
+            except Exception:
+                session.rollback()
+
+        for d in chunk:
+            try:
+                _, match = _upsert_one(session, d)
+                session.commit()
+                if match.row is None:
                     created += 1
                 else:
                     updated += 1
+                ambiguous += match.ambiguous
             except Exception:
-                db.rollback()
+                session.rollback()
                 errors += 1
-            if delay_each:
-                time.sleep(delay_each)
+
+    return {"created": created, "updated": updated, "errors": errors, "ambiguous": ambiguous}
+
+PROGRESS_KEYS = ("discovered", "scraped", "unchanged", "created", "updated", "errors", "ambiguous")
+
+def _bump(progress: Optional[Dict[str, int]], key: str, n: int = 1) -> None:
+    if progress is not None:
+        progress[key] = progress.get(key, 0) + n
+
+def record_hash(detail: Dict[str, Optional[str]]) -> str:
+    """Stable sha256 over a parsed detail record (key order independent)."""
+    blob = json.dumps(detail, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+@dataclass
+class DetailResult:
+    url: str
+    detail: Optional[Dict[str, Optional[str]]] = None  # None => nothing to write
+    status: str = "changed"  # changed | not_modified | same_hash | error
+    status_code: Optional[int] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+
+async def _fetch_detail(
+    fetcher: AsyncFetcher, url: str, state: Optional[FetchState]
+) -> DetailResult:
+    """Conditional GET + parse; `state` is the stored FetchState (only passed for known cars)."""
+    headers: Dict[str, str] = {}
+    if state is not None:
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+    r = await fetcher.get(url, headers=headers or None)
+    if r.status_code == 304 and state is not None:
+        return DetailResult(
+            url, status="not_modified", status_code=304,
+            etag=state.etag, last_modified=state.last_modified, content_hash=state.content_hash,
+        )
+    r.raise_for_status()
+
+    detail = parse_car_detail(r.text, url)
+    h = record_hash(detail)
+    res = DetailResult(
+        url, detail=detail, status_code=r.status_code,
+        etag=r.headers.get("etag"), last_modified=r.headers.get("last-modified"), content_hash=h,
+    )
+    if state is not None and state.content_hash == h:
+        res.detail, res.status = None, "same_hash"
+    return res
+
+def _save_fetch_state(session, res: DetailResult, prev: Optional[FetchState]) -> None:
+    now = datetime.utcnow()
+    state = prev or FetchState(url=res.url)
+    state.etag = res.etag
+    state.last_modified = res.last_modified
+    state.status_code = res.status_code
+    state.fetched_at = now
+    if res.detail is not None:
+        state.content_hash = res.content_hash
+        state.changed_at = now
+    if prev is None:
+        session.add(state)
+
+# Pipeline tuning: bounded queues give backpressure; the writer flushes a
+# partial batch once its oldest item has waited FLUSH_INTERVAL seconds.
+QUEUE_SIZE = 64
+FLUSH_INTERVAL = 1.0
+_DONE = object()
+
+def _load_conditional_states() -> Dict[str, FetchState]:
+    """Detached FetchState rows for cars that still exist (validators are useless otherwise)."""
+    db = ReadSessionLocal()
+    try:
+        rows = db.query(FetchState).join(Car, Car.url == FetchState.url).all()
+        return {s.url: s for s in rows}
     finally:
         db.close()
 
-    return {"created": created, "updated": updated, "errors": errors, "total_urls": len(urls)}
+def _persist_batch(session, batch: List[DetailResult]) -> Dict[str, int]:
+    """Bulk-upsert changed cars and record fetch state for one batch of results."""
+    changed = [r.detail for r in batch if r.detail is not None]
+    counts = (
+        upsert_cars_bulk(session, changed) if changed
+        else {"created": 0, "updated": 0, "errors": 0, "ambiguous": 0}
+    )
+    counts["unchanged"] = len(batch) - len(changed)
+
+    states = {
+        s.url: s
+        for s in session.query(FetchState).filter(FetchState.url.in_([r.url for r in batch]))
+    }
+    # If any car in the batch failed, don't record new validators/hashes for
+    # its changed pages, so the next refresh fetches them in full again.
+    for res in batch:
+        if res.detail is not None and counts["errors"]:
+            continue
+        _save_fetch_state(session, res, states.get(res.url))
+    session.commit()
+    return counts
+
+async def _run_pipeline(
+    limit: int,
+    max_pages: int,
+    concurrency: int,
+    rate_per_host: float,
+    totals: Dict[str, int],
+    progress: Optional[Dict[str, int]],
+) -> None:
+    """
+    discovery -> url queue -> N detail workers -> result queue -> batching writer
+
+    All three stages run at once; the bounded queues stall discovery when the
+    workers fall behind, and the workers when the DB writer does.
+    """
+    states = await asyncio.to_thread(_load_conditional_states)
+    url_q: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    result_q: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    loop = asyncio.get_running_loop()
+
+    async with AsyncFetcher(concurrency=concurrency, rate_per_host=rate_per_host, headers=HEADERS) as fetcher:
+
+        async def discover() -> None:
+            try:
+                async for url in iter_active_urls(fetcher, limit=limit, max_pages=max_pages):
+                    totals["total_urls"] += 1
+                    _bump(progress, "discovered")
+                    await url_q.put(url)
+            finally:
+                for _ in range(concurrency):
+                    await url_q.put(_DONE)
+
+        async def work() -> None:
+            while True:
+                url = await url_q.get()
+                if url is _DONE:
+                    return
+                try:
+                    res = await _fetch_detail(fetcher, url, states.get(url))
+                except Exception:
+                    totals["errors"] += 1
+                    _bump(progress, "errors")
+                    continue
+                _bump(progress, "scraped" if res.detail is not None else "unchanged")
+                await result_q.put(res)
+
+        async def write() -> None:
+            db = SessionLocal()
+            batch: List[DetailResult] = []
+            deadline = 0.0
+
+            async def flush() -> None:
+                try:
+                    counts = await asyncio.to_thread(_persist_batch, db, batch[:])
+                except Exception:
+                    # keep draining so upstream stages never block on a dead writer
+                    log.exception("bulk write of %d cars failed", len(batch))
+                    db.rollback()
+                    counts = {"created": 0, "updated": 0, "unchanged": 0, "errors": len(batch), "ambiguous": 0}
+                batch.clear()
+                for k in ("created", "updated", "unchanged", "errors", "ambiguous"):
+                    totals[k] += counts[k]
+                for k in ("created", "updated", "errors", "ambiguous"):
+                    _bump(progress, k, counts[k])
+
+            try:
+                while True:
+                    timeout = max(0.0, deadline - loop.time()) if batch else None
+                    try:
+                        item = await asyncio.wait_for(result_q.get(), timeout)
+                    except asyncio.TimeoutError:
+                        await flush()
+                        continue
+                    if item is _DONE:
+                        break
+                    if not batch:
+                        deadline = loop.time() + FLUSH_INTERVAL
+                    batch.append(item)
+                    if len(batch) >= BULK_BATCH_SIZE:
+                        await flush()
+                if batch:
+                    await flush()
+            finally:
+                db.close()
+
+        writer = asyncio.create_task(write())
+        workers = [asyncio.create_task(work()) for _ in range(concurrency)]
+        try:
+            await discover()
+            await asyncio.gather(*workers)
+        finally:
+            await result_q.put(_DONE)
+            await writer
+
+def scrape_urls_and_persist(
+    limit: int = 36,
+    max_pages: int = 25,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate_per_host: float = DEFAULT_RATE_PER_HOST,
+    progress: Optional[Dict[str, int]] = None,
+) -> Dict[str, int]:
+    """
+    Stream active listing URLs from the inventory feed into detail workers
+    and a batching DB writer, all running concurrently:
+
+    - detail pages are fetched with bounded concurrency and a per-host rate
+      limit, sending If-None-Match / If-Modified-Since for cars we already have;
+    - pages that returned 304 or hash to the same record as last time are
+      not rewritten;
+    - changed cars are written with upsert_cars_bulk as batches fill up (or
+      after FLUSH_INTERVAL), so the first cars land before discovery ends.
+
+    If `progress` is given, its PROGRESS_KEYS counters are updated in place
+    as the crawl advances (used by the background job runner).
+    """
+    if progress is not None:
+        for k in PROGRESS_KEYS:
+            progress.setdefault(k, 0)
+
+    totals = {"created": 0, "updated": 0, "unchanged": 0, "errors": 0, "ambiguous": 0, "total_urls": 0}
+    asyncio.run(_run_pipeline(limit, max_pages, max(1, concurrency), rate_per_host, totals, progress))
+    return totals
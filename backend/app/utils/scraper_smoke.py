@@ -13,6 +13,7 @@ from app.utils.scraper import (
 )
 from app.db import SessionLocal
 from app.models.car import Car
+from app.utils.serialize import cars_to_dicts, dumps
 
 
 def cmd_urls(args: argparse.Namespace) -> int:
@@ -46,30 +47,7 @@ def cmd_db(args: argparse.Namespace) -> int:
         q = db.query(Car).order_by(Car.id.desc())
         total = q.count()
         items = q.offset(args.offset).limit(args.limit).all()
-        out = []
-        for c in items:
-            out.append(
-                {
-                    "id": c.id,
-                    "url": c.url,
-                    "stock": c.stock,
-                    "vin": c.vin,
-                    "year": c.year,
-                    "make": c.make,
-                    "model": c.model,
-                    "body_style": c.body_style,
-                    "exterior_color": c.exterior_color,
-                    "interior_color": c.interior_color,
-                    "miles": c.miles,
-                    "transmission": c.transmission,
-                    "engine": c.engine,
-                    "price": c.price,
-                    "price_raw": c.price_raw,
-                    "thumb": c.thumb,
-                    "status": c.status,
-                }
-            )
-        print(json.dumps({"count": total, "items": out}, indent=2))
+        print(dumps({"count": total, "items": cars_to_dicts(items)}, indent=True))
         return 0
     finally:
         db.close()
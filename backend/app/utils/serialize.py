@@ -0,0 +1,56 @@
+# backend/app/utils/serialize.py
+"""
+Fast JSON path for bulk car payloads.
+
+Rows are mapped with a single precomputed attrgetter over the Car columns
+and the resulting plain dicts are dumped by orjson directly, skipping
+FastAPI's per-value jsonable_encoder walk and stdlib json.
+"""
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List
+
+import orjson
+from starlette.responses import Response
+
+from app.models.car import Car
+from app.utils.thumbs import thumb_path
+
+# Bookkeeping columns that aren't part of the public car record.
+_HIDDEN = {"created_at", "updated_at", "vin_norm"}
+
+CAR_FIELDS = tuple(c.key for c in Car.__table__.columns if c.key not in _HIDDEN)
+_car_values = attrgetter(*CAR_FIELDS)
+
+
+def car_to_dict(car: Car) -> Dict[str, Any]:
+    d = dict(zip(CAR_FIELDS, _car_values(car)))
+    d["thumb_proxy"] = thumb_path(car.id, car.thumb)  # resized, cacheable copy of `thumb`
+    return d
+
+
+def cars_to_dicts(cars: Iterable[Car]) -> List[Dict[str, Any]]:
+    fields, values = CAR_FIELDS, _car_values
+    out = []
+    for c in cars:
+        d = dict(zip(fields, values(c)))
+        d["thumb_proxy"] = thumb_path(c.id, c.thumb)
+        out.append(d)
+    return out
+
+
+class ORJSONResponse(Response):
+    """
+    JSON response rendered by orjson. Return an instance directly from the
+    endpoint so FastAPI hands the content over without re-encoding it.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def dumps(content: Any, *, indent: bool = False) -> str:
+    return orjson.dumps(content, option=orjson.OPT_INDENT_2 if indent else 0).decode()
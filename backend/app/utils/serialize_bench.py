@@ -0,0 +1,70 @@
+# backend/app/utils/serialize_bench.py
+from __future__ import annotations
+
+import argparse
+import json
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.car import Car
+from app.utils.serialize import ORJSONResponse, cars_to_dicts
+
+
+def _sample_cars(n: int) -> list[Car]:
+    return [
+        Car(
+            id=i, url=f"https://www.sportscarla.com/used-2002-mercedes-benz-sl-class-sl-500-c-{i}.htm",
+            stock=f"A{i:04d}", vin=f"WDBFA68F12F2{i:05d}", year=2002, make="Mercedes-Benz", model="SL-Class",
+            body_style="Convertible", exterior_color="Brilliant Silver Metallic", interior_color="Shell/Black",
+            miles=28823 + i, transmission="5-Speed Automatic", engine="5.0L NA V8 single overhead cam (SOHC) 24V",
+            price=48750, price_raw="$48,750", thumb=f"https://images.example.test/{i}.jpg", status="active",
+        )
+        for i in range(n)
+    ]
+
+
+def _legacy(cars: list[Car]) -> bytes:
+    # what /scan/cars-db did before: hand-built dicts -> jsonable_encoder -> stdlib json (JSONResponse.render)
+    items = [
+        {
+            "id": c.id, "url": c.url, "stock": c.stock, "vin": c.vin, "year": c.year, "make": c.make,
+            "model": c.model, "body_style": c.body_style, "exterior_color": c.exterior_color,
+            "interior_color": c.interior_color, "miles": c.miles, "transmission": c.transmission,
+            "engine": c.engine, "price": c.price, "price_raw": c.price_raw, "thumb": c.thumb, "status": c.status,
+        }
+        for c in cars
+    ]
+    content = jsonable_encoder({"count": len(cars), "items": items})
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def _fast(cars: list[Car]) -> bytes:
+    return ORJSONResponse({"count": len(cars), "items": cars_to_dicts(cars), "next_cursor": None}).body
+
+
+def main(argv: list[str] | None = None) -> int:
+    p = argparse.ArgumentParser(
+        prog="python -m app.utils.serialize_bench",
+        description="Serialization cost of the /scan/cars-db listing payload, old path vs mapper + orjson.",
+    )
+    p.add_argument("--rows", type=int, default=200)
+    p.add_argument("--rounds", type=int, default=200)
+    args = p.parse_args(argv)
+
+    cars = _sample_cars(args.rows)
+    results = {}
+    for name, fn in (("dict+jsonable_encoder+json", _legacy), ("mapper+orjson", _fast)):
+        body = fn(cars)  # warm-up
+        t0 = time.perf_counter()
+        for _ in range(args.rounds):
+            fn(cars)
+        results[name] = (time.perf_counter() - t0) / args.rounds * 1000
+        print(f"{name:<28} {results[name]:>8.3f} ms/payload  {len(body) / 1024:>7.1f} KiB")
+    old, new = results.values()
+    print(f"speedup: {old / new:.1f}x for {args.rows} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+# backend/app/utils/sticker_assets.py
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageFont
+
+Font = ImageFont.FreeTypeFont | ImageFont.ImageFont
+
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class AssetRegistry:
+    """
+    Process-wide cache of decoded sticker assets.
+
+    - template(path): decoded once to RGB; each caller gets a cheap copy to draw on.
+    - font(path, size): one FreeType face per (path, size).
+
+    Both are reloaded when the file's mtime/size change on disk.
+    """
+
+    def __init__(self):
+        self._templates: Dict[str, Tuple[Tuple[int, int], Image.Image]] = {}
+        self._fonts: Dict[Tuple[str, int], Tuple[Optional[Tuple[int, int]], Font]] = {}
+        self._lock = threading.Lock()
+
+    def template(self, path: str) -> Image.Image:
+        """Fresh RGB copy of the template at `path` (raises FileNotFoundError if missing)."""
+        stamp = _stamp(path)
+        if stamp is None:
+            raise FileNotFoundError(path)
+        with self._lock:
+            cached = self._templates.get(path)
+        if cached is None or cached[0] != stamp:
+            with Image.open(path) as im:
+                decoded = im.convert("RGB")
+            with self._lock:
+                self._templates[path] = (stamp, decoded)
+        else:
+            decoded = cached[1]
+        return decoded.copy()
+
+    def font(self, path: Optional[str], size: int) -> Font:
+        """TrueType font at `size`, or PIL's default font if `path` is missing."""
+        stamp = _stamp(path) if path else None
+        key = (path or "", size)
+        with self._lock:
+            cached = self._fonts.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        font: Font = ImageFont.truetype(path, size=size) if stamp else ImageFont.load_default()
+        with self._lock:
+            self._fonts[key] = (stamp, font)
+        return font
+
+    def clear(self) -> None:
+        with self._lock:
+            self._templates.clear()
+            self._fonts.clear()
+
+
+assets = AssetRegistry()
@@ -0,0 +1,156 @@
+# backend/app/utils/sticker_cache.py
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Bump when the drawing code changes in a way that alters output for the same payload.
+RENDER_VERSION = "2"
+
+CACHE_DIR = os.getenv("STICKER_CACHE_DIR", os.path.join(tempfile.gettempdir(), "scla-stickers"))
+MEM_MAX_ITEMS = int(os.getenv("STICKER_CACHE_MEM_ITEMS", "128"))
+DISK_MAX_BYTES = int(os.getenv("STICKER_CACHE_DISK_MB", "200")) * 1024 * 1024
+
+_template_versions: Dict[str, tuple] = {}
+_template_lock = threading.Lock()
+
+
+def template_version(path: str) -> str:
+    """Content hash of the template file, recomputed only when its mtime/size change."""
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    with _template_lock:
+        cached = _template_versions.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+    with open(path, "rb") as fh:
+        digest = hashlib.sha256(fh.read()).hexdigest()[:16]
+    with _template_lock:
+        _template_versions[path] = (stamp, digest)
+    return digest
+
+
+def sticker_key(payload: dict, template_ver: str, fmt: str = "png") -> str:
+    """Deterministic cache key / strong ETag for one rendered sticker."""
+    blob = json.dumps(
+        {"p": payload, "t": template_ver, "r": RENDER_VERSION, "f": fmt},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return etag in tags or f"W/{etag}" in tags
+
+
+class StickerCache:
+    """
+    Two-tier cache of encoded sticker bytes:
+      - memory: LRU bounded by item count
+      - disk:   one file per key under CACHE_DIR, bounded by total bytes,
+                least-recently-used files evicted first
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, mem_items: int = MEM_MAX_ITEMS, disk_bytes: int = DISK_MAX_BYTES):
+        self.directory = directory
+        self.mem_items = mem_items
+        self.disk_bytes = disk_bytes
+        self._mem: "OrderedDict[str, bytes]" = OrderedDict()
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> size, LRU order
+        self._disk_total = 0
+        self._lock = threading.Lock()
+        self._scan_disk()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.bin")
+
+    def _scan_disk(self) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(".bin"):
+                    continue
+                st = os.stat(os.path.join(self.directory, name))
+                entries.append((st.st_atime, name[:-4], st.st_size))
+        except OSError:
+            return
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_total += size
+
+    def contains(self, key: str) -> bool:
+        """Cheap membership check (no disk read)."""
+        with self._lock:
+            return key in self._mem or key in self._disk
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._mem.get(key)
+            if data is not None:
+                self._mem.move_to_end(key)
+                return data
+            on_disk = key in self._disk
+        if not on_disk:
+            return None
+        try:
+            with open(self._path(key), "rb") as fh:
+                data = fh.read()
+        except OSError:
+            with self._lock:
+                self._disk_total -= self._disk.pop(key, 0)
+            return None
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._remember(key, data)
+            if key in self._disk:
+                self._disk.move_to_end(key)
+                return
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            return  # disk tier is best-effort
+        with self._lock:
+            # another thread may have written the same key meanwhile
+            self._disk_total += len(data) - self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            self._evict_disk()
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._mem[key] = data
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.mem_items:
+            self._mem.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        while self._disk_total > self.disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_total -= size
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+
+sticker_cache = StickerCache()
@@ -0,0 +1,63 @@
+# backend/app/utils/sticker_encode.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable, Dict
+
+from PIL import Image
+
+from app.utils.pdf_stream import StreamingPdfWriter
+
+
+@dataclass(frozen=True)
+class OutputProfile:
+    name: str
+    media_type: str
+    ext: str
+    encode: Callable[[Image.Image, float], bytes]  # (rendered RGB image, dpi) -> bytes
+    description: str
+
+
+def _png(img: Image.Image, dpi: float, level: int = 6) -> bytes:
+    out = BytesIO()
+    img.save(out, format="PNG", compress_level=level, dpi=(dpi, dpi))
+    return out.getvalue()
+
+
+def _png_palette(img: Image.Image, dpi: float) -> bytes:
+    # Sticker art is flat colours + anti-aliased text, so 256 colours are visually lossless.
+    pal = img.quantize(colors=256, method=Image.Quantize.FASTOCTREE)
+    out = BytesIO()
+    pal.save(out, format="PNG", optimize=True, dpi=(dpi, dpi))
+    return out.getvalue()
+
+
+def _webp_lossless(img: Image.Image, dpi: float) -> bytes:
+    out = BytesIO()
+    img.save(out, format="WEBP", lossless=True, quality=60, method=4)
+    return out.getvalue()
+
+
+def _pdf(img: Image.Image, dpi: float) -> bytes:
+    # single page at the template's native DPI; the PNG is embedded without re-encoding
+    pdf = StreamingPdfWriter(dpi=dpi)
+    return pdf.begin() + pdf.add_png(_png(img, dpi)) + pdf.finish()
+
+
+PROFILES: Dict[str, OutputProfile] = {
+    p.name: p
+    for p in (
+        OutputProfile("png", "image/png", "png", _png, "PNG, default zlib level (6)"),
+        OutputProfile("png-fast", "image/png", "png", lambda im, dpi: _png(im, dpi, level=1),
+                      "PNG, zlib level 1 - interactive preview"),
+        OutputProfile("png-small", "image/png", "png", _png_palette,
+                      "256-colour palette PNG - small downloads"),
+        OutputProfile("webp", "image/webp", "webp", _webp_lossless, "lossless WebP - small downloads"),
+        OutputProfile("pdf", "application/pdf", "pdf", _pdf, "print-ready PDF at template DPI"),
+    )
+}
+
+
+def encode(img: Image.Image, profile: str, dpi: float) -> bytes:
+    return PROFILES[profile].encode(img, dpi)
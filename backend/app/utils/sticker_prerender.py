@@ -0,0 +1,154 @@
+# backend/app/utils/sticker_prerender.py
+"""
+Change-driven sticker pre-rendering.
+
+When a car is created or a field drawn on its sticker changes, its default
+(PNG) sticker is rendered in the background and dropped into the sticker
+cache, so the first download is a cache hit. Renders go through the shared
+render pool one at a time, so a scrape touching hundreds of cars never
+starves interactive /stickers requests of workers.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.utils.render_pool import RenderPoolFull, render_pool
+from app.utils.sticker_cache import sticker_cache, sticker_key, template_version
+from app.utils.sticker_render import TEMPLATE_PATH, payload_from_car
+
+log = logging.getLogger(__name__)
+
+PRERENDER_ENABLED = os.getenv("STICKER_PRERENDER", "1") != "0"
+PRERENDER_QUEUE = int(os.getenv("STICKER_PRERENDER_QUEUE", "1000"))
+PRERENDER_PROFILE = "png"
+
+# Car columns that end up on the sticker (see payload_from_car).
+STICKER_FIELDS = (
+    "url", "year", "make", "model", "vin", "miles", "engine", "transmission",
+    "exterior_color", "interior_color", "stock", "price", "price_raw",
+)
+
+_SESSION_KEY = "sticker_prerender"
+
+
+def sticker_fields(car) -> Tuple:
+    return tuple(getattr(car, f, None) for f in STICKER_FIELDS)
+
+
+class StickerPrerenderer:
+    """Deduplicating background queue feeding the render pool one sticker at a time."""
+
+    def __init__(self, maxsize: int = PRERENDER_QUEUE):
+        self._q: "queue.Queue[Tuple[str, dict]]" = queue.Queue(maxsize=maxsize)
+        self._queued: Set[str] = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._counts: Dict[str, int] = {"queued": 0, "rendered": 0, "skipped": 0, "dropped": 0, "failed": 0}
+
+    def enqueue(self, payload: dict) -> bool:
+        """Schedule a render unless it's already cached or queued; never blocks."""
+        if not PRERENDER_ENABLED or self._stop.is_set():
+            return False
+        try:
+            key = sticker_key(payload, template_version(TEMPLATE_PATH), PRERENDER_PROFILE)
+        except FileNotFoundError:
+            return False  # no template, nothing to pre-render
+        with self._lock:
+            if key in self._queued or sticker_cache.contains(key):
+                self._counts["skipped"] += 1
+                return False
+            try:
+                self._q.put_nowait((key, payload))
+            except queue.Full:
+                self._counts["dropped"] += 1  # rendered on demand instead
+                return False
+            self._queued.add(key)
+            self._counts["queued"] += 1
+            self._ensure_thread()
+        return True
+
+    def enqueue_cars(self, cars: Iterable) -> int:
+        return sum(self.enqueue(payload_from_car(c)) for c in cars)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="sticker-prerender", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                key, payload = self._q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                if not sticker_cache.contains(key):
+                    data = self._render(payload)
+                    if data is None:
+                        return  # stopping
+                    sticker_cache.put(key, data)
+                with self._lock:
+                    self._counts["rendered"] += 1
+            except Exception:
+                log.exception("sticker pre-render failed for %s", payload.get("url"))
+                with self._lock:
+                    self._counts["failed"] += 1
+            finally:
+                with self._lock:
+                    self._queued.discard(key)
+
+    def _render(self, payload: dict) -> Optional[bytes]:
+        # through the pool's admission slots like any other render; wait for
+        # one in short steps so stop() isn't held up by a busy pool
+        while not self._stop.is_set():
+            try:
+                fut = render_pool.submit(payload, PRERENDER_PROFILE, wait=1.0)
+            except RenderPoolFull:
+                continue
+            return fut.result()[0]
+        return None
+
+    def start(self) -> None:
+        """Accept work again after stop() (the thread itself starts on the first enqueue)."""
+        self._stop.clear()
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Stop taking work and wait for the current render; call before render_pool.shutdown()."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {"pending": len(self._queued), **self._counts}
+
+
+prerenderer = StickerPrerenderer()
+
+
+# ---------- session hooks ----------
+# upsert_car runs inside a caller-owned transaction, so it only marks the car;
+# the render is scheduled once that transaction actually commits.
+
+def mark_changed(session: Session, car) -> None:
+    session.info.setdefault(_SESSION_KEY, []).append(payload_from_car(car))
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_marked(session: Session) -> None:
+    for payload in session.info.pop(_SESSION_KEY, ()):
+        prerenderer.enqueue(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_marked(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
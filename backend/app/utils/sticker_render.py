@@ -0,0 +1,216 @@
+# backend/app/utils/sticker_render.py
+"""Sticker drawing, shared by the stickers API and the batch/render workers."""
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+# --- Pillow & QR ---
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except Exception as e:  # pragma: no cover
+    raise RuntimeError("Pillow (PIL) is required for sticker generation.") from e
+
+from app.utils.qr_cache import QR_SIZE, qr_image
+from app.utils.sticker_assets import assets
+from app.utils.sticker_encode import encode
+from app.utils.text_fit import fit_font
+
+# ---- paths ----
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))         # backend/app
+ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+TEMPLATE_PATH = os.path.join(ASSETS_DIR, "sticker_template.png")
+# The 1056x816 template is US Letter landscape at 96 DPI; used for print output sizing.
+TEMPLATE_DPI = float(os.getenv("STICKER_TEMPLATE_DPI", "96"))
+
+# A reasonably present on macOS; we’ll fallback to PIL’s default if missing.
+DEFAULT_FONT_PATH = "/System/Library/Fonts/Supplemental/Arial.ttf"
+
+# ---------- tiny helpers ----------
+
+def _load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """TrueType font if available (memoized per size); fall back to PIL default."""
+    return assets.font(DEFAULT_FONT_PATH, size)
+
+def _fmt_price_for_sticker(price_raw: Optional[str], price_num: Optional[int]) -> str:
+    if price_raw and price_raw.strip():
+        return price_raw.strip()
+    if price_num and price_num > 0:
+        return f"${price_num:,}"
+    return "Not Available"
+
+def _text_or_na(value: Optional[str]) -> str:
+    v = (value or "").strip()
+    return v if v else "Not Available"
+
+def _shrink_to_fit(draw: ImageDraw.ImageDraw, text: str, max_width: int, start_font_size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    """Return a font that ensures `text` fits in `max_width` (never < 10px)."""
+    return fit_font(text, max_width, start_font_size, DEFAULT_FONT_PATH)
+
+def render_sticker_image(data: dict) -> Image.Image:
+    """Draw values onto the template exactly per your coordinates and return the RGB image."""
+
+    # 1) Load template (decoded once per process; we draw on a copy)
+    try:
+        img = assets.template(TEMPLATE_PATH)
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"Sticker template not found at {TEMPLATE_PATH}. "
+            "Place 'sticker_template.png' in backend/app/assets/."
+        )
+    draw = ImageDraw.Draw(img)
+
+    # 2) Fonts (base sizes; will shrink for long strings)
+    font_small = _load_font(28)
+    font_price = _load_font(70)
+
+    # 3) Field coordinates (your exact map)
+    # NOTE: these positions assume your provided PNG layout.
+    positions = {
+        "year": (40, 210),
+        "make": (120, 210),
+        "model": (330, 210),
+
+        "vin": (130, 290),
+
+        "mileage": (170, 340),          # will append “ mi” below
+        "engine": (200, 400),
+        "trans": (210, 450),
+
+        "exterior_color": (235, 500),
+        "interior_color": (235, 560),
+        "stock": (225, 620),
+
+        "price": (150, 660)
+    }
+
+    # 4) Box max widths (helps truncate/shrink to fit cleanly)
+    #    Adjust if you tweak the template later.
+    max_widths = {
+        "year": 70,
+        "make": 180,
+        "model": 320,
+
+        "vin": 680,
+
+        "mileage": 300,
+        "engine": 650,
+        "trans": 650,
+
+        "exterior_color": 650,
+        "interior_color": 650,
+        "stock": 650,
+
+        "price": 450,  # big, but keep consistent with visual
+    }
+
+    # 5) Normalize data for rendering
+    year   = _text_or_na(data.get("year"))
+    make   = _text_or_na(data.get("make"))
+    model  = _text_or_na(data.get("model"))
+    vin    = _text_or_na(data.get("vin"))
+
+    # For mileage on the sticker we want the raw string with “ mi” if numeric available
+    mileage_str = data.get("mileage") or data.get("miles")
+    if isinstance(mileage_str, (int, float)):
+        mileage = f"{int(mileage_str):,} mi"
+    else:
+        mileage = _text_or_na(mileage_str)
+        # if it's only digits and commas, append " mi"
+        if mileage and mileage not in ("Not Available",) and any(ch.isdigit() for ch in mileage):
+            mileage = f"{mileage} mi"
+
+    engine = _text_or_na(data.get("engine"))
+    trans  = _text_or_na(data.get("trans") or data.get("transmission"))
+
+    exterior_color = _text_or_na(data.get("exterior_color"))
+    interior_color = _text_or_na(data.get("interior_color"))
+    stock  = _text_or_na(data.get("stock"))
+    price  = _text_or_na(data.get("price"))
+
+    # 6) Draw with shrink-to-fit for each line (black text except price)
+    def draw_line(key: str, text: str, base_font: ImageFont.ImageFont, fill=(0, 0, 0)):
+        x, y = positions[key]
+        max_w = max_widths[key]
+        font = _shrink_to_fit(draw, text, max_w, getattr(base_font, "size", 28))
+        draw.text((x, y), text, font=font, fill=fill)
+
+    # FIRST ROW
+    draw_line("year", year, font_small)
+    draw_line("make", make, font_small)
+    draw_line("model", model, font_small)
+
+    # VIN
+    draw_line("vin", vin, font_small)
+
+    # LEFT COLUMN
+    draw_line("mileage", mileage, font_small)
+    draw_line("engine", engine, font_small)
+    draw_line("trans", trans, font_small)
+
+    draw_line("exterior_color", exterior_color, font_small)
+    draw_line("interior_color", interior_color, font_small)
+    draw_line("stock", stock, font_small)
+
+    # PRICE (red, large)
+    # Ensure price fits in its box by shrinking if needed
+    x_p, y_p = positions["price"]
+    max_p = max_widths["price"]
+    font_for_price = _shrink_to_fit(draw, price, max_p, getattr(font_price, "size", 70))
+    draw.text((x_p, y_p), price, font=font_for_price, fill=(220, 0, 0))
+
+    # 7) QR code at (40, 650) – same as your earlier layout
+    url = (data.get("url") or "").strip()
+    if url:
+        try:
+            img.paste(qr_image(url, QR_SIZE), (40, 650))
+        except Exception:
+            # If QR generation fails, skip silently (don’t fail the sticker)
+            pass
+
+    return img
+
+def render_sticker(data: dict, profile: str = "png") -> bytes:
+    """Render and encode with one of sticker_encode.PROFILES (png, png-fast, webp, pdf, ...)."""
+    return encode(render_sticker_image(data), profile, TEMPLATE_DPI)
+
+
+# ---------- payloads ----------
+
+def payload_from_car(car) -> dict:
+    """Sticker fields for a Car row."""
+    return {
+        "year": str(car.year or "") or "",
+        "make": car.make or "",
+        "model": car.model or "",
+        "vin": car.vin or "",
+        "mileage": car.miles if car.miles is not None else "",
+        "engine": car.engine or "",
+        "trans": car.transmission or "",
+        "exterior_color": car.exterior_color or "",
+        "interior_color": car.interior_color or "",
+        "stock": car.stock or "",
+        "price": _fmt_price_for_sticker(car.price_raw, car.price),
+        "url": car.url,
+    }
+
+def payload_from_detail(detail: dict, url: str) -> dict:
+    """Sticker fields for a freshly scraped detail record."""
+    return {
+        "year": detail.get("year") or "",
+        "make": detail.get("make") or "",
+        "model": detail.get("model") or "",
+        "vin": detail.get("vin") or "",
+        "mileage": detail.get("miles") or "",
+        "engine": detail.get("engine") or "",
+        "trans": detail.get("transmission") or "",
+        "exterior_color": detail.get("exterior_color") or "",
+        "interior_color": detail.get("interior_color") or "",
+        "stock": detail.get("stock") or "",
+        "price": _fmt_price_for_sticker(detail.get("price"), None),
+        "url": url,
+    }
+
+def sticker_filename(payload: dict, ext: str = "png") -> str:
+    base = (payload.get("stock") or payload.get("vin") or "sticker").replace("/", "-")
+    return f"{base}.{ext}"
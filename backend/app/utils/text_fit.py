@@ -0,0 +1,50 @@
+# backend/app/utils/text_fit.py
+"""
+Text fitting for sticker fields.
+
+Widths are memoized per (font object, text); the registry hands out one
+font object per (path, size), so that is effectively (font, size, text).
+`fit_font` binary-searches the size instead of stepping down one point at a
+time.
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Optional
+
+from app.utils.sticker_assets import Font, assets
+
+MIN_FONT_SIZE = 10
+
+
+@lru_cache(maxsize=8192)
+def text_width(font: Font, text: str) -> int:
+    """Rendered pixel width of `text` (same box as ImageDraw.textbbox at the origin)."""
+    left, _, right, _ = font.getbbox(text)
+    return right - left
+
+
+def fit_font(
+    text: str,
+    max_width: int,
+    start_size: int,
+    font_path: Optional[str],
+    min_size: int = MIN_FONT_SIZE,
+) -> Font:
+    """
+    Largest font in [min_size, start_size] whose `text` fits in `max_width`;
+    `min_size` if nothing fits. O(log n) sizes measured instead of O(n).
+    """
+    lo, hi = min_size, max(start_size, min_size)
+    if text_width(assets.font(font_path, hi), text) <= max_width:
+        return assets.font(font_path, hi)
+    best = min_size
+    hi -= 1
+    while lo <= hi:
+        mid = (lo + hi) // 2
+        if text_width(assets.font(font_path, mid), text) <= max_width:
+            best = mid
+            lo = mid + 1
+        else:
+            hi = mid - 1
+    return assets.font(font_path, best)
@@ -0,0 +1,180 @@
+# backend/app/utils/thumb_prefetch.py
+"""
+Scrape-driven thumbnail prefetch.
+
+When a crawl creates a car or changes its `thumb`, the photo is downloaded
+and every grid/detail derivative is written to the thumbnail cache in the
+background, so the first grid view after a crawl is all cache hits. A small
+pool of threads bounds how many photos are fetched at once; each source is
+decoded once (JPEG draft mode, at the largest size needed) and cut down to
+every size from that one image.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.utils.render_pool import _pct
+from app.utils.thumbs import (
+    FORMATS,
+    SIZES,
+    ThumbSourceError,
+    decode_source,
+    derivative_key,
+    encode_derivative,
+    fetch_source,
+    thumb_cache,
+)
+
+log = logging.getLogger(__name__)
+
+PREFETCH_ENABLED = os.getenv("THUMB_PREFETCH", "1") != "0"
+PREFETCH_WORKERS = int(os.getenv("THUMB_PREFETCH_WORKERS", "4"))
+PREFETCH_QUEUE = int(os.getenv("THUMB_PREFETCH_QUEUE", "2000"))
+# formats written ahead of time; other formats are still made on request
+PREFETCH_FORMATS = tuple(
+    f for f in (f.strip() for f in os.getenv("THUMB_PREFETCH_FORMATS", "webp").split(",")) if f in FORMATS
+)
+
+_SESSION_KEY = "thumb_prefetch"
+
+
+def _missing(src_url: str) -> List[tuple]:
+    return [
+        (size, fmt)
+        for size in SIZES
+        for fmt in PREFETCH_FORMATS
+        if not thumb_cache.contains(derivative_key(src_url, size, fmt))
+    ]
+
+
+class ThumbPrefetcher:
+    """Deduplicating background queue of source photo URLs, drained by a few threads."""
+
+    def __init__(self, workers: int = PREFETCH_WORKERS, maxsize: int = PREFETCH_QUEUE):
+        self.workers = max(1, workers)
+        self._q: "queue.Queue[str]" = queue.Queue(maxsize=maxsize)
+        self._queued: Set[str] = set()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._counts: Dict[str, int] = {
+            "queued": 0, "done": 0, "skipped": 0, "dropped": 0,
+            "fetch_failed": 0, "decode_failed": 0, "derivatives": 0,
+        }
+        self._fetch_ms: deque = deque(maxlen=512)
+        self._process_ms: deque = deque(maxlen=512)
+
+    def enqueue(self, src_url: Optional[str]) -> bool:
+        """Schedule a photo unless it's already queued or fully cached; never blocks."""
+        if not (PREFETCH_ENABLED and src_url and PREFETCH_FORMATS):
+            return False
+        with self._lock:
+            if src_url in self._queued or not _missing(src_url):
+                self._counts["skipped"] += 1
+                return False
+            try:
+                self._q.put_nowait(src_url)
+            except queue.Full:
+                self._counts["dropped"] += 1  # made on first request instead
+                return False
+            self._queued.add(src_url)
+            self._counts["queued"] += 1
+            self._ensure_threads()
+        return True
+
+    def _ensure_threads(self) -> None:
+        self._threads = [t for t in self._threads if t.is_alive()]
+        for i in range(len(self._threads), self.workers):
+            t = threading.Thread(target=self._run, name=f"thumb-prefetch-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def _run(self) -> None:
+        while True:
+            src_url = self._q.get()
+            try:
+                self._process(src_url)
+            except Exception:
+                log.exception("thumbnail prefetch crashed for %s", src_url)
+            finally:
+                with self._lock:
+                    self._queued.discard(src_url)
+
+    def _process(self, src_url: str) -> None:
+        missing = _missing(src_url)
+        if not missing:
+            with self._lock:
+                self._counts["skipped"] += 1
+            return
+
+        t0 = time.perf_counter()
+        try:
+            src = fetch_source(src_url)
+        except ThumbSourceError as e:
+            log.warning("thumbnail prefetch: %s: %s", src_url, e)
+            with self._lock:
+                self._counts["fetch_failed"] += 1
+            return
+        t1 = time.perf_counter()
+
+        try:
+            # decode once, big enough for the largest derivative still missing
+            img = decode_source(src, max(SIZES[size] for size, _ in missing))
+            for size, fmt in missing:
+                thumb_cache.put(derivative_key(src_url, size, fmt), encode_derivative(img, SIZES[size], fmt))
+        except Exception as e:
+            log.warning("thumbnail prefetch: %s: %s", src_url, e)
+            with self._lock:
+                self._counts["decode_failed"] += 1
+            return
+        t2 = time.perf_counter()
+
+        with self._lock:
+            self._counts["done"] += 1
+            self._counts["derivatives"] += len(missing)
+            self._fetch_ms.append((t1 - t0) * 1000)
+            self._process_ms.append((t2 - t1) * 1000)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            fetch, process = list(self._fetch_ms), list(self._process_ms)
+            return {
+                "workers": self.workers,
+                "pending": len(self._queued),
+                **self._counts,
+                "fetch_ms_p50": _pct(fetch, 0.50),
+                "fetch_ms_p95": _pct(fetch, 0.95),
+                "process_ms_p50": _pct(process, 0.50),  # decode + resize + encode, all sizes
+                "process_ms_p95": _pct(process, 0.95),
+            }
+
+
+prefetcher = ThumbPrefetcher()
+
+
+# ---------- session hooks ----------
+# Same pattern as sticker pre-rendering: mark inside the scrape's transaction,
+# schedule once it commits.
+
+def mark_thumb(session: Session, src_url: Optional[str]) -> None:
+    if src_url:
+        session.info.setdefault(_SESSION_KEY, []).append(src_url)
+
+
+@event.listens_for(Session, "after_commit")
+def _flush_marked(session: Session) -> None:
+    for src_url in session.info.pop(_SESSION_KEY, ()):
+        prefetcher.enqueue(src_url)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_marked(session: Session) -> None:
+    session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,159 @@
+# backend/app/utils/thumbs.py
+"""
+Car photo derivatives for the grids.
+
+The scraped `thumb` is the dealer's full-size first photo. We fetch each
+source once, keep it, and cut fixed-width WebP/JPEG derivatives from it; both
+live in a size-capped LRU disk cache. Derivative URLs carry a version derived
+from the source URL, so they can be served as immutable.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import threading
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, Optional
+
+import httpx
+from PIL import Image, ImageOps
+
+from app.utils.fetcher import DEFAULT_TIMEOUT, HEADERS
+from app.utils.sticker_cache import StickerCache
+
+# named sizes -> target width in px (height follows the aspect ratio)
+SIZES: Dict[str, int] = {"grid": 480, "detail": 1280}
+
+THUMB_CACHE_DIR = os.getenv("THUMB_CACHE_DIR", os.path.join(tempfile.gettempdir(), "scla-thumbs"))
+THUMB_CACHE_MB = int(os.getenv("THUMB_CACHE_MB", "100"))
+THUMB_SOURCE_CACHE_MB = int(os.getenv("THUMB_SOURCE_CACHE_MB", "200"))
+THUMB_MEM_ITEMS = int(os.getenv("THUMB_CACHE_MEM_ITEMS", "256"))
+MAX_SOURCE_BYTES = int(os.getenv("THUMB_MAX_SOURCE_MB", "15")) * 1024 * 1024
+
+
+class ThumbSourceError(Exception):
+    """The source photo couldn't be fetched or decoded."""
+
+
+@dataclass(frozen=True)
+class ThumbFormat:
+    media_type: str
+    save_kwargs: dict
+
+
+FORMATS: Dict[str, ThumbFormat] = {
+    "webp": ThumbFormat("image/webp", {"format": "WEBP", "quality": 80, "method": 4}),
+    "jpeg": ThumbFormat("image/jpeg", {"format": "JPEG", "quality": 82, "optimize": True, "progressive": True}),
+}
+
+# Same two-tier (memory + size-capped disk) LRU used for stickers, separate directories/budgets.
+# Originals are multi-MB, so they stay on disk only.
+thumb_cache = StickerCache(THUMB_CACHE_DIR, mem_items=THUMB_MEM_ITEMS, disk_bytes=THUMB_CACHE_MB * 1024 * 1024)
+source_cache = StickerCache(
+    os.path.join(THUMB_CACHE_DIR, "src"), mem_items=0, disk_bytes=THUMB_SOURCE_CACHE_MB * 1024 * 1024
+)
+
+# one fetch/resize per key at a time; concurrent requests wait and then hit the cache
+_locks = [threading.Lock() for _ in range(64)]
+
+
+def thumb_version(src_url: str) -> str:
+    return hashlib.sha256(src_url.encode("utf-8")).hexdigest()[:12]
+
+
+def thumb_path(car_id: int, src_url: Optional[str], size: str = "grid", fmt: str = "webp") -> Optional[str]:
+    """Versioned (immutable) proxy path for a car's photo, or None when it has none."""
+    if not src_url:
+        return None
+    return f"/thumbs/{car_id}?size={size}&fmt={fmt}&v={thumb_version(src_url)}"
+
+
+def _key(src_url: str, suffix: str) -> str:
+    return f"{hashlib.sha256(src_url.encode('utf-8')).hexdigest()[:40]}-{suffix}"
+
+
+def _lock_for(key: str) -> threading.Lock:
+    return _locks[hash(key) % len(_locks)]
+
+
+def fetch_source(src_url: str) -> bytes:
+    key = _key(src_url, "src")
+    data = source_cache.get(key)
+    if data is not None:
+        return data
+    try:
+        with httpx.stream("GET", src_url, headers=HEADERS, timeout=DEFAULT_TIMEOUT, follow_redirects=True) as r:
+            r.raise_for_status()
+            chunks, size = [], 0
+            for chunk in r.iter_bytes():
+                size += len(chunk)
+                if size > MAX_SOURCE_BYTES:
+                    raise ThumbSourceError(f"source image larger than {MAX_SOURCE_BYTES} bytes")
+                chunks.append(chunk)
+    except httpx.HTTPError as e:
+        raise ThumbSourceError(f"fetch failed: {e}") from e
+    data = b"".join(chunks)
+    source_cache.put(key, data)
+    return data
+
+
+_ORIENTATION = 0x0112  # EXIF tag; values 5-8 mean the stored image is rotated 90 degrees
+
+
+def decode_source(src: bytes, width: int) -> Image.Image:
+    """
+    Upright RGB/L image, at least `width` px wide where the source allows.
+    JPEGs use draft(): libjpeg scales by 1/2, 1/4 or 1/8 while decoding, so
+    a 4000px photo destined for a 480px card is never fully decoded.
+    """
+    try:
+        img = Image.open(BytesIO(src))
+        if img.format == "JPEG":
+            w, h = img.size
+            rotated = img.getexif().get(_ORIENTATION) in (5, 6, 7, 8)
+            if rotated:  # displayed width is the stored height
+                w, h = h, w
+            if w > width:
+                target = (width, max(1, round(h * width / w)))
+                img.draft("RGB", target[::-1] if rotated else target)
+        img.load()  # decode now: a truncated file must fail here, not later in resize()
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+    except Exception as e:
+        raise ThumbSourceError(f"not a decodable image: {e}") from e
+    return img
+
+
+def encode_derivative(img: Image.Image, width: int, fmt: str) -> bytes:
+    if img.width > width:
+        height = max(1, round(img.height * width / img.width))
+        img = img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    out = BytesIO()
+    img.save(out, **FORMATS[fmt].save_kwargs)
+    return out.getvalue()
+
+
+def make_derivative(src: bytes, width: int, fmt: str) -> bytes:
+    return encode_derivative(decode_source(src, width), width, fmt)
+
+
+def derivative_key(src_url: str, size: str, fmt: str) -> str:
+    return _key(src_url, f"{SIZES[size]}.{fmt}")
+
+
+def get_thumb(src_url: str, size: str = "grid", fmt: str = "webp") -> bytes:
+    """Derivative bytes for `src_url`, fetching/resizing only on a cache miss."""
+    width = SIZES[size]
+    key = derivative_key(src_url, size, fmt)
+    data = thumb_cache.get(key)
+    if data is not None:
+        return data
+    with _lock_for(key):
+        data = thumb_cache.get(key)
+        if data is None:
+            data = make_derivative(fetch_source(src_url), width, fmt)
+            thumb_cache.put(key, data)
+    return data
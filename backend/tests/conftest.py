@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# a throwaway DB for anything that touches app.db; set before the app is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='scla-test-')}/test.db")
+os.environ.setdefault("STICKER_PRERENDER", "0")
+os.environ.setdefault("THUMB_PREFETCH", "0")
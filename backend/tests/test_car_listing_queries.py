@@ -0,0 +1,67 @@
+"""
+Query budget for GET /cars/: a page costs 1 query lean and 2 with
+?include=services, however many cars are on it (guards against N+1).
+"""
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from app import schemas
+from app.db import Base
+from app.models import Car, ServiceItem
+from app.routers.cars import list_cars
+from app.utils.car_query import CarFilters
+
+N_CARS = 50
+SERVICES_PER_CAR = 3
+
+
+@contextmanager
+def count_queries(engine) -> Iterator[List[str]]:
+    statements: List[str] = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+
+
+@pytest.fixture
+def seeded():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        for i in range(N_CARS):
+            car = Car(url=f"https://example.test/c-{i}.htm", year=2000 + i % 20, make="Porsche", model="911")
+            car.services = [ServiceItem(description=f"service {j}") for j in range(SERVICES_PER_CAR)]
+            session.add(car)
+        session.commit()
+        session.expunge_all()
+        yield engine, session
+
+
+def _listing(session: Session, include=None) -> dict:
+    out = list_cars(
+        filters=CarFilters(), sort="created", cursor=None, limit=N_CARS, total=False, include=include, db=session
+    )
+    return schemas.CarPageOut.model_validate(out).model_dump()
+
+
+@pytest.mark.parametrize("include, budget", [(None, 1), ("services", 2)])
+def test_listing_query_budget(seeded, include, budget):
+    engine, session = seeded
+    with count_queries(engine) as stmts:
+        body = _listing(session, include)
+
+    assert len(body["items"]) == N_CARS
+    assert len(stmts) == budget, "\n".join(" ".join(s.split())[:120] for s in stmts)
+    services = sum(len(item.get("services", [])) for item in body["items"])
+    assert services == (N_CARS * SERVICES_PER_CAR if include else 0)
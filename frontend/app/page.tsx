@@ -10,6 +10,7 @@ type Car = {
   price_raw?: string;
   miles?: number | null;
   thumb?: string | null;
+  thumb_proxy?: string | null;
   status?: string;
   exterior_color?: string | null;
   interior_color?: string | null;
@@ -24,8 +25,9 @@ function fmtMiles(n?: number | null) {
   return `${n.toLocaleString()} mi`;
 }
 
+const base = process.env.NEXT_PUBLIC_API_URL?.replace(/\/+$/, "") || "http://127.0.0.1:8000";
+
 async function getCars(): Promise<Car[]> {
-  const base = process.env.NEXT_PUBLIC_API_URL?.replace(/\/+$/, "") || "http://127.0.0.1:8000";
   const res = await fetch(`${base}/scan/cars-db?limit=200`, { cache: "no-store" });
   if (!res.ok) return [];
   const data = await res.json();
@@ -64,10 +66,14 @@ export default async function Page() {
                 display: "block",
               }}
             >
-              {c.thumb && (
+              {(c.thumb_proxy || c.thumb) && (
                 <img
-                  src={c.thumb}
+                  src={c.thumb_proxy ? `${base}${c.thumb_proxy}` : c.thumb!}
                   alt={title}
+                  loading="lazy"
+                  decoding="async"
+                  width={480}
+                  height={270}
                   style={{ width: "100%", aspectRatio: "16/9", objectFit: "cover", borderRadius: 8, marginBottom: 12 }}
                 />
               )}
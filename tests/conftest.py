@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# keep test runs off the real cars.db; must be set before app.db is imported
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='dashboard-test-')}/cars.db")
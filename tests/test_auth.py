@@ -0,0 +1,57 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import auth
+from app.main import app
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+def test_valid_session_passes(client):
+    client.cookies.set("session", auth.sessions.issue())
+    assert client.get("/login", follow_redirects=False).status_code == 200
+    assert auth.sessions.verify(client.cookies.get("session"))
+
+
+@pytest.mark.parametrize("cookie", [
+    "9999999999.x|é",  # non-ASCII signature
+    "9999999999.é|abc",
+    "ok|c2ln",  # pre-expiry cookie format
+    "not-a-token",
+    "",
+])
+def test_bad_cookie_redirects_to_login(client, cookie):
+    r = client.get("/", headers={"cookie": f"session={cookie}".encode()}, follow_redirects=False)
+    assert r.status_code == 307
+    assert r.headers["location"] == "/login"
+
+
+def test_tampered_and_expired_tokens_rejected():
+    store = auth.SessionStore()
+    token = store.issue()
+    value, sig = token.split("|", 1)
+    assert not store.verify(f"{value}|{sig[:-2]}xx")
+    assert not store.verify(f"{int(time.time()) + 999999}.{value.split('.', 1)[1]}|{sig}")
+    assert not store.verify(store.issue(ttl=-1))
+
+
+def test_revoked_token_rejected_even_if_cached():
+    store = auth.SessionStore()
+    token = store.issue()
+    assert store.verify(token)
+    store.revoke(token)
+    assert not store.verify(token)
+
+
+def test_cache_holds_digests_not_tokens():
+    store = auth.SessionStore()
+    token = store.issue()
+    assert store.verify(token)
+    assert token not in store._verified
+    assert all(isinstance(k, bytes) and len(k) == 32 for k in store._verified)
+    assert token not in repr(store._verified)
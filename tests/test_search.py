@@ -0,0 +1,52 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from app import search
+
+DDL = """CREATE TABLE car (
+    id INTEGER PRIMARY KEY, stock VARCHAR, make VARCHAR, model VARCHAR, vin VARCHAR, created_at DATETIME
+)"""
+CARS = [
+    (1, "P1234", "Porsche", "911", "WP0ABXYZ123456789", "2024-01-01"),
+    (2, "A2100", "Porsche", "Cayman", "WP0CDXYZ987654321", "2024-01-02"),
+    (3, "B7788", "BMW", "M3", "WBS00000000000001", "2024-01-03"),
+    (4, "C9911", "Ferrari", "F430", "ZFFAB0000XYZ00001", "2024-01-04"),
+]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/search.db")
+    with engine.begin() as c:
+        c.exec_driver_sql(DDL)
+        c.execute(
+            text("INSERT INTO car VALUES (:id, :stock, :make, :model, :vin, :created_at)"),
+            [dict(zip(("id", "stock", "make", "model", "vin", "created_at"), row)) for row in CARS],
+        )
+    search.install(engine)  # backfills both indexes from existing rows
+    with engine.connect() as c:
+        yield c
+
+
+def test_prefix_matches_rank_first(conn):
+    assert search.search_ids(conn, "porsche") == [2, 1]  # same relevance, newest first
+    assert search.search_ids(conn, "porsche cay") == [2]
+
+
+@pytest.mark.parametrize("q, expected", [
+    ("xyz", {1, 2, 4}),  # middle of a VIN, like the old ILIKE / Postgres
+    ("BXYZ12", {1}),
+    ("788", {3}),  # middle of a stock number
+    ("00", {2, 3, 4}),  # shorter than a trigram: LIKE fallback (A2100 too)
+    ("porsche 9876", {2}),  # word prefix AND vin substring
+    ("nothing", set()),
+])
+def test_substring_matches_on_vin_and_stock(conn, q, expected):
+    assert set(search.search_ids(conn, q)) == expected
+
+
+def test_triggers_keep_substring_index_in_sync(conn):
+    conn.execute(text("UPDATE car SET vin = 'WBSQQQ00000000001' WHERE id = 3"))
+    assert search.search_ids(conn, "QQQ") == [3]
+    conn.execute(text("DELETE FROM car WHERE id = 3"))
+    assert search.search_ids(conn, "QQQ") == []
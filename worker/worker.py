@@ -1,10 +1,27 @@
-import os, time, asyncio, httpx
+"""
+Inventory sync worker.
+
+Each pass fetches the inventory page, diffs it against the last-seen state
+on disk, and pushes only new/changed cars to the backend's /cars/bulk
+(batched, a few requests in flight, one keep-alive client). Listings missing from
+MISSING_SCANS consecutive passes are marked sold. Passes are jittered and
+run more often while something has changed recently.
+"""
+import asyncio, hashlib, json, os, random, time
+import httpx
 from bs4 import BeautifulSoup
 from pydantic import BaseModel
 
 BACKEND = os.getenv("BACKEND_URL", "http://backend:8000")
 SCRAPE_URL = os.getenv("SCRAPE_URL", "")
 INTERVAL = int(os.getenv("SCAN_INTERVAL", "3600"))
+HOT_INTERVAL = int(os.getenv("HOT_SCAN_INTERVAL", "300"))  # while something changed within HOT_WINDOW
+HOT_WINDOW = int(os.getenv("HOT_WINDOW", "21600"))
+JITTER = float(os.getenv("SCAN_JITTER", "0.1"))  # +/- fraction of the interval
+MISSING_SCANS = int(os.getenv("MISSING_SCANS", "2"))  # passes a listing must be gone before it's sold
+BATCH_SIZE = int(os.getenv("POST_BATCH_SIZE", "100"))
+CONCURRENCY = int(os.getenv("POST_CONCURRENCY", "2"))
+STATE_PATH = os.getenv("STATE_PATH", "state/last_seen.json")
 API_TOKEN = os.getenv("API_TOKEN", "")
 
 class Car(BaseModel):
@@ -15,37 +32,139 @@ class Car(BaseModel):
     miles: int | None = None
     price: float | None = None
 
-async def upsert_car(client: httpx.AsyncClient, car: Car):
+def fingerprint(car: Car) -> str:
+    return hashlib.sha1(car.model_dump_json().encode()).hexdigest()
+
+# ---------- state ----------
+# {url: {"hash": str, "changed": ts, "missing": int, "sold": bool}}
+
+def load_state() -> dict:
+    try:
+        with open(STATE_PATH) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(state: dict):
+    os.makedirs(os.path.dirname(STATE_PATH) or ".", exist_ok=True)
+    tmp = f"{STATE_PATH}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(state, fh)
+    os.replace(tmp, STATE_PATH)
+
+# ---------- scan ----------
+
+def parse_card(c) -> Car:
+    link = c.select_one("a").get("href")
+    title = c.select_one(".title").get_text(strip=True)
+    price_txt = c.select_one(".price").get_text(strip=True).replace("$","").replace(",","")
+    miles_txt = c.select_one(".miles").get_text(strip=True).replace(",","")
+    year, make, model = title.split(" ", 3)[:3]
+    return Car(
+        url=link,
+        year=int(year),
+        make=make,
+        model=model,
+        miles=int(miles_txt.split()[0]),
+        price=float(price_txt.split()[0])
+    )
+
+async def scan(client: httpx.AsyncClient) -> dict[str, Car]:
+    r = await client.get(SCRAPE_URL)
+    r.raise_for_status()
+    soup = BeautifulSoup(r.text, "html.parser")
+    # TODO: Replace with real selectors for SportscarLA inventory
+    cars = {}
+    for c in soup.select(".inventory-card"):
+        try:
+            car = parse_card(c)
+        except Exception as e:  # one odd card shouldn't sink the pass
+            print("[worker] skipping card:", e)
+            continue
+        cars[car.url] = car
+    return cars
+
+def diff(state: dict, cars: dict[str, Car]) -> tuple[list[dict], list[str]]:
+    """(payloads to post, urls that vanished long enough to be sold)."""
+    changed = []
+    for url, car in cars.items():
+        prev = state.get(url)
+        if prev is None or prev["hash"] != fingerprint(car) or prev.get("sold"):
+            changed.append({**car.model_dump(), "status": "available"})
+    sold = []
+    if cars:  # an empty page is a broken scrape, not a sold-out lot
+        for url, prev in state.items():
+            if url not in cars and not prev.get("sold") and prev.get("missing", 0) + 1 >= MISSING_SCANS:
+                sold.append(url)
+    return changed, sold
+
+# ---------- push ----------
+
+async def post_batches(client: httpx.AsyncClient, payloads: list[dict]) -> set[str]:
+    """POST /cars/bulk per BATCH_SIZE cars, CONCURRENCY batches in flight; returns the URLs applied."""
+    sem = asyncio.Semaphore(CONCURRENCY)
+    ok: set[str] = set()
+    # the backend token goes on these requests only, never on the scrape
     headers = {"Authorization": f"Bearer {API_TOKEN}"} if API_TOKEN else {}
-    await client.post(f"{BACKEND}/cars/", json=car.model_dump(), headers=headers)
-
-async def scan_once():
-    async with httpx.AsyncClient(timeout=60) as client:
-        r = await client.get(SCRAPE_URL)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        # TODO: Replace with real selectors for SportscarLA inventory
-        cards = soup.select(".inventory-card")
-        for c in cards:
-            link = c.select_one("a").get("href")
-            title = c.select_one(".title").get_text(strip=True)
-            price_txt = c.select_one(".price").get_text(strip=True).replace("$","").replace(",","")
-            miles_txt = c.select_one(".miles").get_text(strip=True).replace(",","")
-            year, make, model = title.split(" ", 3)[:3]
-            car = Car(
-                url=link,
-                year=int(year),
-                make=make,
-                model=model,
-                miles=int(miles_txt.split()[0]),
-                price=float(price_txt.split()[0])
-            )
-            await upsert_car(client, car)
+
+    async def post(batch: list[dict]):
+        async with sem:
+            try:
+                r = await client.post(f"{BACKEND}/cars/bulk", json=batch, headers=headers)
+                r.raise_for_status()
+                results = r.json()["results"]
+            except (httpx.HTTPError, ValueError, KeyError, TypeError) as e:
+                print(f"[worker] bulk post of {len(batch)} cars failed: {e!r}")  # retried next pass
+                return
+        for res in results:
+            if res["status"] == "error":
+                print(f"[worker] {res['url']}: {res['error']}")
+            else:
+                ok.add(batch[res["index"]]["url"])
+
+    await asyncio.gather(*(post(payloads[i:i + BATCH_SIZE]) for i in range(0, len(payloads), BATCH_SIZE)))
+    return ok
+
+async def sync_once(client: httpx.AsyncClient, state: dict) -> dict:
+    cars = await scan(client)
+    first_run = not state  # the initial import isn't "recent activity"
+    changed, sold = diff(state, cars)
+    ok = await post_batches(client, changed + [{"url": u, "status": "sold"} for u in sold])
+
+    now = time.time()
+    stamp = 0 if first_run else now
+    for url, car in cars.items():
+        prev = state.get(url)
+        if url in ok:
+            state[url] = {"hash": fingerprint(car), "changed": stamp, "missing": 0, "sold": False}
+        elif prev is not None:
+            prev["missing"] = 0
+    for url, prev in state.items():
+        if url in cars:
+            continue
+        if url in ok:
+            prev.update(sold=True, changed=stamp)
+        elif not prev.get("sold"):
+            prev["missing"] = prev.get("missing", 0) + 1
+    save_state(state)
+    return {"seen": len(cars), "posted": len(ok & set(cars)), "sold": len(ok - set(cars)),
+            "failed": len(changed) + len(sold) - len(ok)}
+
+def next_delay(state: dict) -> float:
+    hot = any(time.time() - s.get("changed", 0) < HOT_WINDOW for s in state.values())
+    base = HOT_INTERVAL if hot else INTERVAL
+    return base * random.uniform(1 - JITTER, 1 + JITTER)
+
+async def run():
+    state = load_state()
+    limits = httpx.Limits(max_connections=CONCURRENCY + 1, max_keepalive_connections=CONCURRENCY + 1)
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        while True:
+            try:
+                print("[worker] pass:", await sync_once(client, state))
+            except Exception as e:
+                print("[worker] scan error:", e)
+            await asyncio.sleep(next_delay(state))
 
 if __name__ == "__main__":
-    while True:
-        try:
-            asyncio.run(scan_once())
-        except Exception as e:
-            print("[worker] scan error:", e)
-        time.sleep(INTERVAL)
+    asyncio.run(run())